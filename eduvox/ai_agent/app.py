@@ -1,15 +1,31 @@
 from flask import Flask, request, jsonify
 from core.debate_module import DebateAgent
-from core.interview_module import InterviewAgent
-from core.ai_model import AIModel
+from core.interview_module import InterviewAgent, warmup_ocr
+from core.ai_model import get_default_model
+from core.interview_session import InterviewSessionStore
 # from core.resume_analyser import ResumeAnalyser  # Assuming this is the resume analyzer module
 import os
+import json
 import tempfile
 
 app = Flask(__name__)
 
-# Initialize the AI model
-ai_model = AIModel()
+# Live turn-based interview sessions (kept in this process)
+interview_sessions = InterviewSessionStore()
+
+def init_process():
+    """
+    Per-process startup: create the shared AI model, check connectivity and
+    optionally warm OCR. Not run at import time because OCR pool workers are
+    spawned and re-import this module; call it from __main__ or a WSGI
+    server's post-fork hook.
+    """
+    get_default_model().check_connectivity()
+
+    # OCR models load lazily on the first resume; workers that serve interviews
+    # can load them up front instead (OCR_WARMUP=1)
+    if os.getenv("OCR_WARMUP") == "1":
+        warmup_ocr()
 
 # Route for Text Debate
 @app.route('/text-debate', methods=['POST'])
@@ -22,7 +38,7 @@ def text_debate():
         if not topic or not stance:
             return jsonify({"error": "Topic and stance are required"}), 400
 
-        debate_agent = DebateAgent(ai_model)
+        debate_agent = DebateAgent(get_default_model())
         report = debate_agent.conduct_debate(topic, stance)
         return jsonify({"report": report}), 200
     except Exception as e:
@@ -38,7 +54,7 @@ def voice_debate():
         if not topic:
             return jsonify({"error": "Topic is required"}), 400
 
-        debate_agent = DebateAgent(ai_model, voice_mode=True)
+        debate_agent = DebateAgent(get_default_model(), voice_mode=True)
         report = debate_agent.conduct_voice_debate(topic)
         return jsonify({"report": report}), 200
     except Exception as e:
@@ -58,8 +74,9 @@ def interview():
         if file.filename == '':
             return jsonify({"error": "No selected file"}), 400
 
-        # Save the file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
+        # Save the file temporarily, keeping its extension so PDFs take the PDF path
+        suffix = os.path.splitext(file.filename)[1].lower() or ".png"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
             file_path = temp_file.name
             file.save(file_path)
 
@@ -77,7 +94,7 @@ def interview():
                 return jsonify({"error": "Job profile and difficulty level are required"}), 400
 
             # Conduct the interview
-            interview_agent = InterviewAgent(ai_model)
+            interview_agent = InterviewAgent(get_default_model())
             report = interview_agent.run_interview(data, file_path)
 
             return jsonify({"report": report}), 200
@@ -88,10 +105,81 @@ def interview():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Turn-based interview: start, answer question by question, then finish
+@app.route('/interview/start', methods=['POST'])
+def interview_start():
+    try:
+        if 'file' not in request.files or request.files['file'].filename == '':
+            return jsonify({"error": "No file provided"}), 400
+        file = request.files['file']
+
+        data = json.loads(request.form.get('data') or '{}')
+        job_profile = data.get('job_profile')
+        difficulty = data.get('difficulty')
+        if not job_profile or not difficulty:
+            return jsonify({"error": "Job profile and difficulty level are required"}), 400
+
+        suffix = os.path.splitext(file.filename)[1].lower() or ".png"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            file_path = temp_file.name
+            file.save(file_path)
+        try:
+            interview_agent = InterviewAgent(get_default_model())
+            candidate_info = interview_agent.collect_candidate_info(job_profile, file_path)
+            questions = interview_agent.generate_interview_questions(candidate_info, difficulty)
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        session = interview_sessions.add(interview_agent.start_session(candidate_info, difficulty, questions))
+        return jsonify({
+            "session_id": session.id,
+            "question": session.current_question(),
+            "index": 0,
+            "total": len(questions)
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/interview/<session_id>/answer', methods=['POST'])
+def interview_answer(session_id):
+    try:
+        session = interview_sessions.get(session_id)
+        if session is None:
+            return jsonify({"error": "Unknown or expired interview session"}), 404
+        if session.done:
+            return jsonify({"error": "All questions have already been answered"}), 400
+
+        answer = (request.json or {}).get('answer', '')
+        try:
+            next_question = session.submit_answer(answer)
+        except ValueError as e:
+            # Another request answered the last question first
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "question": next_question,
+            "index": len(session.history),
+            "total": len(session.questions),
+            "done": session.done
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/interview/<session_id>/finish', methods=['POST'])
+def interview_finish(session_id):
+    try:
+        session = interview_sessions.pop(session_id)
+        if session is None:
+            return jsonify({"error": "Unknown or expired interview session"}), 404
+        return jsonify({"report": session.finish()}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # Default route
 @app.route('/')
 def home():
     return jsonify({"message": "Welcome to the AI Agent API!"}), 200
 
 if __name__ == "__main__":
+    init_process()
     app.run(debug=True)
\ No newline at end of file
@@ -1,34 +1,315 @@
 import os
+import time
+import queue
+import asyncio
+import threading
+import concurrent.futures
 from dotenv import load_dotenv
 import google.generativeai as genai
+from core.response_cache import ResponseCache
+from core.single_flight import SingleFlight
+from core.simulated_backend import SimulatedModel
+from core.resilience import get_policy, is_transient
+from core.json_extract import extract_json
+from utils.rate_limiter import RateLimitExceeded, get_rate_limiter
 
 class AIModel:
-    def __init__(self, model_name='gemini-2.0-flash'):
+    def __init__(self, model_name='gemini-2.0-flash', max_concurrency=None, timeout=None, cache=None, coalesce=True,
+                 backend=None, resilience=None):
         # Load environment variables
         load_dotenv()
-        
-        # Configure API key
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            raise ValueError("API key not found. Create a .env file with GEMINI_API_KEY=your_key")
-        
-        # Configure the model
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
-    
-    def generate_response(self, prompt, max_tokens=500):
-        """Generate a response from the model"""
-        try:
-            generation_config = {
-                'max_output_tokens': max_tokens,
-                'temperature': 0.7,  # Creativity level
-                'top_p': 1  # Diversity of response
-            }
-            response = self.model.generate_content(
-                prompt, 
-                generation_config=generation_config
-            )
+        self.model_name = model_name
+
+        # "gemini" talks to the real API, "simulated" serves canned responses offline
+        self.backend = (backend or os.getenv('AI_MODEL_BACKEND', 'gemini')).lower()
+        if self.backend == 'simulated':
+            self.model = SimulatedModel.from_env(model_name)
+        elif self.backend == 'gemini':
+            # Configure API key
+            api_key = os.getenv('GEMINI_API_KEY')
+            if not api_key:
+                raise ValueError("API key not found. Create a .env file with GEMINI_API_KEY=your_key")
+
+            # Configure the model
+            genai.configure(api_key=api_key)
+            self.model = genai.GenerativeModel(model_name)
+        else:
+            raise ValueError(f"Unknown AI model backend: {self.backend}")
+
+        # Concurrency limit and per-call timeout (seconds) for upstream calls
+        self.max_concurrency = max_concurrency or int(os.getenv('GEMINI_MAX_CONCURRENCY', 16))
+        self.timeout = timeout or float(os.getenv('GEMINI_TIMEOUT', 30))
+
+        # All upstream I/O runs on one background event loop so the async
+        # client (and its pooled connection) is created once and shared
+        self._loop = None
+        self._loop_thread = None
+        self._semaphore = None
+        self._loop_lock = threading.Lock()
+
+        # Optional prompt/response cache; AI_RESPONSE_CACHE enables a SQLite-backed one
+        cache_path = os.getenv('AI_RESPONSE_CACHE')
+        if cache is None and cache_path:
+            cache = ResponseCache(cache_path)
+        self.cache = cache
+
+        # Host-wide Gemini quota shared with the other workers (real backend only)
+        self.rate_limiter = get_rate_limiter() if self.backend == 'gemini' else None
+
+        # Retry/hedge/circuit-breaker policy, shared process-wide with InterviewAgent
+        self.resilience = resilience or get_policy("gemini")
+
+        # Identical prompts already in flight share one upstream request
+        self.single_flight = SingleFlight() if coalesce else None
+
+        # Result of the connectivity check (None until checked); a failed
+        # check is only trusted for GEMINI_RECHECK_SECONDS
+        self._connected = None
+        self._checked_at = 0.0
+        self.recheck_after = float(os.getenv('GEMINI_RECHECK_SECONDS', 60))
+
+    def _build_generation_config(self, max_tokens, response_format=None):
+        """
+        Generation settings shared by every call.
+        response_format "json" asks for JSON output; a dict is also sent as the response schema.
+        """
+        config = {
+            'max_output_tokens': max_tokens,
+            'temperature': 0.7,  # Creativity level
+            'top_p': 1  # Diversity of response
+        }
+        if response_format:
+            config['response_mime_type'] = 'application/json'
+            if isinstance(response_format, dict):
+                config['response_schema'] = response_format
+        return config
+
+    def _ensure_loop(self):
+        """Start the background event loop on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="ai-model-loop",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _check_expired(self):
+        return time.monotonic() - self._checked_at >= self.recheck_after
+
+    def check_connectivity(self):
+        """
+        Probe the API once per process, straight upstream (never from the
+        response cache or a coalesced call). A failed probe is retried once
+        it is older than recheck_after.
+        """
+        if self._connected is None or (self._connected is False and self._check_expired()):
+            probe = self._call_upstream(None, "ping", self._build_generation_config(8), self.timeout)
+            self._connected = asyncio.run_coroutine_threadsafe(probe, self._ensure_loop()).result() is not None
+            self._checked_at = time.monotonic()
+            print("Gemini API connected successfully!" if self._connected else "Gemini API not reachable")
+        return self._connected
+
+    @property
+    def available(self):
+        """
+        False only while a failed connectivity check is recent; after that
+        calls go ahead and the circuit breaker decides whether they reach upstream
+        """
+        return not (self._connected is False and not self._check_expired())
+
+    async def _generate(self, prompt, max_tokens, timeout, response_format=None):
+        """Serve from cache, coalesce identical in-flight prompts, else call upstream"""
+        timeout = timeout or self.timeout
+        generation_config = self._build_generation_config(max_tokens, response_format)
+        key = ResponseCache.make_key(self.model_name, prompt, generation_config)
+
+        if self.cache is not None:
+            cached = await self.cache.get_async(key)
+            if cached is not None:
+                return cached
+
+        upstream = lambda: self._call_upstream(key, prompt, generation_config, timeout)
+        if self.single_flight is not None:
+            return await self.single_flight.do(key, upstream)
+        return await upstream()
+
+    async def _acquire_quota(self, timeout):
+        """Wait for a Gemini rate-limit token, up to the call's deadline"""
+        if self.rate_limiter is not None and not await self.rate_limiter.acquire_async('gemini', timeout=timeout):
+            raise RateLimitExceeded("Gemini rate limit reached")
+
+    async def _call_upstream(self, key, prompt, generation_config, timeout):
+        """Run one upstream call on the background loop, within `timeout` seconds overall (key=None skips caching)"""
+        async def attempt(remaining):
+            async with self._semaphore:
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': remaining}
+                )
             return response.text.strip()
+
+        deadline = time.monotonic() + timeout
+        try:
+            # Local throttling is not an upstream failure: it must not be
+            # retried or count against the circuit breaker
+            await self._acquire_quota(timeout)
+        except RateLimitExceeded as e:
+            print(f"Error generating response: {e}")
+            return None
+
+        try:
+            # Retries, hedging and the circuit breaker live in the policy;
+            # they share whatever is left of the call's deadline
+            text = await self.resilience.call(attempt, max(0.0, deadline - time.monotonic()))
+            if self.cache is not None and key is not None:
+                self.cache.set_nowait(key, text)
+            return text
+        except asyncio.TimeoutError:
+            print(f"Error generating response: timed out after {timeout}s")
+            return None
         except Exception as e:
             print(f"Error generating response: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    async def generate_response_async(self, prompt, max_tokens=500, timeout=None, response_format=None):
+        """Generate a response without blocking the caller's event loop"""
+        loop = self._ensure_loop()
+        coro = self._generate(prompt, max_tokens, timeout, response_format)
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def generate_response(self, prompt, max_tokens=500, timeout=None, response_format=None):
+        """Generate a response from the model (safe to call from any thread)"""
+        loop = self._ensure_loop()
+        timeout = timeout or self.timeout
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate(prompt, max_tokens, timeout, response_format), loop
+        )
+        try:
+            # The call enforces its own deadline; this only guards against a stuck loop
+            return future.result(timeout + 5)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            print(f"Error generating response: no result after {timeout}s")
+            return None
+
+    def generate_json(self, prompt, schema=None, max_tokens=500, timeout=None, expect=None):
+        """
+        Request JSON output (constrained by schema when given) and parse it.
+        Tolerates prose, code fences and truncation; returns None if nothing parses.
+        """
+        text = self.generate_response(prompt, max_tokens, timeout, response_format=schema or "json")
+        return extract_json(text, expect)
+
+    async def _stream(self, prompt, max_tokens, timeout, chunks):
+        """Push streamed text chunks onto a queue; None marks the end"""
+        timeout = timeout or self.timeout
+        generation_config = self._build_generation_config(max_tokens)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(self.model_name, prompt, generation_config)
+            cached = await self.cache.get_async(cache_key)
+            if cached is not None:
+                chunks.put(cached)
+                chunks.put(None)
+                return
+
+        try:
+            await self._acquire_quota(timeout)
+        except RateLimitExceeded as e:
+            print(f"Error streaming response: {e}")
+            chunks.put(None)
+            return
+
+        # Streams are not retried or hedged, but still respect the circuit breaker
+        if not self.resilience.breaker.allow():
+            print("Error streaming response: circuit breaker open; skipping upstream call")
+            chunks.put(None)
+            return
+
+        parts = []
+        try:
+            async with self._semaphore:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config,
+                        request_options={'timeout': timeout},
+                        stream=True
+                    ),
+                    timeout
+                )
+                async for chunk in response:
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        chunks.put(chunk.text)
+            self.resilience.breaker.record_success()
+            if cache_key is not None and parts:
+                self.cache.set_nowait(cache_key, "".join(parts).strip())
+        except asyncio.CancelledError:
+            # Consumer stopped reading; drop the rest of the generation
+            self.resilience.breaker.record_success()
+            raise
+        except asyncio.TimeoutError:
+            self.resilience.breaker.record_failure()
+            print(f"Error streaming response: timed out after {timeout}s")
+        except Exception as e:
+            if is_transient(e):
+                self.resilience.breaker.record_failure()
+            else:
+                self.resilience.breaker.record_success()
+            print(f"Error streaming response: {e}")
+        finally:
+            chunks.put(None)
+
+    def stream_response(self, prompt, max_tokens=500, timeout=None):
+        """Yield text chunks as they arrive; closing the generator stops generation"""
+        timeout = timeout or self.timeout
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(prompt, max_tokens, timeout, chunks),
+            self._ensure_loop()
+        )
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    print(f"Error streaming response: no data for {timeout}s")
+                    break
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def close(self):
+        """Stop the background event loop"""
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join()
+                self._loop.close()
+                self._loop = None
+                self._loop_thread = None
+                self._semaphore = None
+
+_default_model = None
+_default_model_lock = threading.Lock()
+
+def get_default_model():
+    """Process-wide AIModel, created on first use"""
+    global _default_model
+    with _default_model_lock:
+        if _default_model is None:
+            _default_model = AIModel()
+        return _default_model
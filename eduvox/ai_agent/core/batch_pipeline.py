@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from pdf2image import pdfinfo_from_path
+from core.ai_model import get_default_model
+from core.resume_cache import ResumeCache, get_resume_cache
+from core.question_bank import get_question_bank
+from core.interview_module import (
+    InterviewAgent, read_pdf_text_layer, complete_pdf_text, ocr_image_file, get_ocr_pool, ocr_workers
+)
+
+RESUME_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.tiff')
+
+def iter_jobs(source, job_profile=None, difficulty=None):
+    """
+    Resumes to screen from a directory (every resume file, using the given
+    job profile and difficulty) or a JSONL manifest of
+    {"path", "job_profile", "difficulty"} lines (paths relative to the manifest).
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield {"path": os.path.abspath(os.path.join(source, name)),
+                       "job_profile": job_profile, "difficulty": difficulty}
+        return
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            yield {"path": os.path.abspath(os.path.join(base, entry["path"])),
+                   "job_profile": entry.get("job_profile", job_profile),
+                   "difficulty": entry.get("difficulty", difficulty)}
+
+class Stage:
+    """A pool of worker threads draining one bounded queue"""
+    def __init__(self, name, fn, workers, capacity):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox = queue.Queue(maxsize=capacity)
+        self.stats = {"processed": 0, "errors": 0, "busy_seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, seconds, failed):
+        with self._lock:
+            self.stats["processed"] += 1
+            self.stats["busy_seconds"] += seconds
+            if failed:
+                self.stats["errors"] += 1
+
+class ResumeBatchPipeline:
+    """
+    Screens many resumes with the stages pipelined:
+    extract (cache lookup + PDF text layer) -> ocr (only when needed) ->
+    analyze (Gemini, regex fallback) -> questions.
+    Each stage has its own worker pool and a bounded queue in front of it, so
+    OCR keeps the process pool busy while the LLM stages wait at the Gemini
+    rate limit instead of failing. Results are appended to a JSONL file as
+    each resume finishes; rerunning skips resumes already written there.
+    """
+    def __init__(self, output_path, ai_model=None, extract_workers=None, ocr_stage_workers=None,
+                 analysis_workers=None, question_workers=None):
+        self.output_path = output_path
+        self.ai_model = ai_model or get_default_model()
+        self.resume_cache = get_resume_cache()
+        self.question_bank = get_question_bank()
+
+        sizes = {
+            "extract": extract_workers or int(os.getenv("BATCH_EXTRACT_WORKERS", 2)),
+            # Threads here only hand pages to the OCR process pool (OCR_WORKERS)
+            "ocr": ocr_stage_workers or int(os.getenv("BATCH_OCR_WORKERS", max(2, ocr_workers() // 2))),
+            "analyze": analysis_workers or int(os.getenv("BATCH_ANALYSIS_WORKERS", 4)),
+            "questions": question_workers or int(os.getenv("BATCH_QUESTION_WORKERS", 2))
+        }
+        fns = {"extract": self._extract, "ocr": self._ocr, "analyze": self._analyze, "questions": self._questions}
+        self.stages = {name: Stage(name, fns[name], size, capacity=size * 2) for name, size in sizes.items()}
+
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._done = threading.Condition()
+
+    # ----------------- Stages -----------------
+
+    def _agent(self):
+        # Agents keep per-interview state, so each record gets its own
+        return InterviewAgent(self.ai_model, self.resume_cache, self.question_bank)
+
+    def _wait_for_quota(self):
+        if self.ai_model.rate_limiter is not None:
+            self.ai_model.rate_limiter.wait_available('gemini')
+
+    def _extract(self, record):
+        path = record["path"]
+        record["resume_key"] = ResumeCache.make_key(path, self.ai_model.model_name)
+        cached = self.resume_cache.get(record["resume_key"])
+        if cached and cached["analysis"]:
+            record["extraction_method"] = "cache"
+            record["candidate_info"] = {
+                "job_profile": record["job_profile"],
+                "skills": cached["analysis"].get('skills', []),
+                "experience": cached["analysis"].get('experience', ""),
+                "achievements": cached["analysis"].get('achievements', [])
+            }
+            return "questions"
+        if cached:
+            record["text"], record["extraction_method"] = cached["text"], "cache"
+            return "analyze"
+
+        if path.lower().endswith('.pdf'):
+            layer = read_pdf_text_layer(path)
+            if layer is None:
+                page_count = pdfinfo_from_path(path)["Pages"]
+                layer = ({}, list(range(1, page_count + 1)), page_count)
+            record["pdf_layer"] = layer
+            if layer[1]:
+                return "ocr"
+            record["text"], record["extraction_method"] = complete_pdf_text(path, *layer)
+            return "analyze"
+        return "ocr"
+
+    def _ocr(self, record):
+        path = record["path"]
+        if "pdf_layer" in record:
+            record["text"], record["extraction_method"] = complete_pdf_text(path, *record.pop("pdf_layer"))
+        elif ocr_workers() > 1:
+            record["text"], record["extraction_method"] = get_ocr_pool().submit(ocr_image_file, path).result(), "ocr"
+        else:
+            record["text"], record["extraction_method"] = ocr_image_file(path), "ocr"
+        return "analyze"
+
+    def _analyze(self, record):
+        if not record["text"].strip():
+            raise ValueError("No text could be extracted from the resume")
+        self._wait_for_quota()
+        fields, gemini_analysis = self._agent().analyze_resume_text(record["text"])
+        self.resume_cache.set(
+            record["resume_key"], record["text"], fields if gemini_analysis else None, record["extraction_method"]
+        )
+        record["candidate_info"] = {"job_profile": record["job_profile"], **fields}
+        return "questions"
+
+    def _questions(self, record):
+        self._wait_for_quota()
+        record["questions"] = self._agent().generate_interview_questions(record["candidate_info"], record["difficulty"])
+        return None
+
+    # ----------------- Plumbing -----------------
+
+    def _worker(self, stage):
+        while True:
+            record = stage.inbox.get()
+            if record is None:
+                return
+            start = time.perf_counter()
+            try:
+                next_stage = stage.fn(record)
+                failed = False
+            except Exception as e:
+                record["error"] = f"{stage.name}: {e}"
+                next_stage, failed = None, True
+            stage.record(time.perf_counter() - start, failed)
+            if next_stage is None:
+                self._results.put(record)
+            else:
+                self.stages[next_stage].inbox.put(record)
+
+    def _writer(self, out):
+        while True:
+            record = self._results.get()
+            if record is None:
+                return
+            out.write(json.dumps({
+                "path": record["path"],
+                "job_profile": record["job_profile"],
+                "difficulty": record["difficulty"],
+                "extraction_method": record.get("extraction_method"),
+                "candidate_info": record.get("candidate_info"),
+                "questions": record.get("questions"),
+                "error": record.get("error"),
+                "seconds": round(time.perf_counter() - record["started"], 3)
+            }) + "\n")
+            out.flush()
+            with self._done:
+                self._outstanding -= 1
+                self._done.notify_all()
+
+    def _completed(self):
+        """(path, job_profile, difficulty) already written without an error"""
+        done = set()
+        if not os.path.exists(self.output_path):
+            return done
+        with open(self.output_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # line cut short by a crash
+                if not entry.get("error"):
+                    done.add((entry["path"], entry["job_profile"], entry["difficulty"]))
+        return done
+
+    def _ends_with_newline(self):
+        with open(self.output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def run(self, jobs):
+        """Process every job not already in the output file; returns per-stage stats"""
+        completed = self._completed()
+        threads = [
+            threading.Thread(target=self._worker, args=(stage,), name=f"batch-{stage.name}", daemon=True)
+            for stage in self.stages.values() for _ in range(stage.workers)
+        ]
+        started = time.perf_counter()
+        skipped = 0
+        with open(self.output_path, "a") as out:
+            if out.tell() and not self._ends_with_newline():
+                out.write("\n")  # don't append onto a line cut short by a crash
+            writer = threading.Thread(target=self._writer, args=(out,), name="batch-writer", daemon=True)
+            writer.start()
+            for thread in threads:
+                thread.start()
+
+            for job in jobs:
+                if (job["path"], job["job_profile"], job["difficulty"]) in completed:
+                    skipped += 1
+                    continue
+                with self._done:
+                    self._outstanding += 1
+                record = dict(job, started=time.perf_counter())
+                if not job["job_profile"] or not job["difficulty"]:
+                    record["error"] = "Job profile and difficulty level are required"
+                    self._results.put(record)
+                    continue
+                # Blocks while the extract queue is full, so memory stays bounded
+                self.stages["extract"].inbox.put(record)
+
+            with self._done:
+                self._done.wait_for(lambda: self._outstanding == 0)
+            for stage in self.stages.values():
+                for _ in range(stage.workers):
+                    stage.inbox.put(None)
+            self._results.put(None)
+            writer.join()
+
+        return self.get_stats(time.perf_counter() - started, skipped)
+
+    def get_stats(self, wall_seconds, skipped=0):
+        stats = {"wall_seconds": round(wall_seconds, 2), "skipped": skipped, "stages": {}}
+        for name, stage in self.stages.items():
+            s = dict(stage.stats)
+            s["workers"] = stage.workers
+            s["per_second"] = round(s["processed"] / wall_seconds, 2) if wall_seconds else 0.0
+            s["avg_seconds"] = round(s["busy_seconds"] / s["processed"], 3) if s["processed"] else 0.0
+            s["utilisation"] = round(s["busy_seconds"] / (wall_seconds * stage.workers), 2) if wall_seconds else 0.0
+            s["busy_seconds"] = round(s["busy_seconds"], 2)
+            stats["stages"][name] = s
+        return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory or JSONL manifest of resumes")
+    parser.add_argument("source", help="directory of resumes or JSONL manifest")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL results file (appended, resumable)")
+    parser.add_argument("--job-profile", help="job profile for resumes without one")
+    parser.add_argument("--difficulty", choices=["Entry", "Mid", "Senior"], help="difficulty for resumes without one")
+    args = parser.parse_args(argv)
+
+    pipeline = ResumeBatchPipeline(args.output)
+    stats = pipeline.run(iter_jobs(args.source, args.job_profile, args.difficulty))
+
+    print(f"\nFinished in {stats['wall_seconds']}s ({stats['skipped']} already done)")
+    print(f"{'stage':<10} {'workers':>7} {'done':>6} {'errors':>6} {'per sec':>8} {'avg s':>7} {'util':>5}")
+    for name, s in stats["stages"].items():
+        print(f"{name:<10} {s['workers']:>7} {s['processed']:>6} {s['errors']:>6} "
+              f"{s['per_second']:>8} {s['avg_seconds']:>7} {s['utilisation']:>5}")
+    return stats
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
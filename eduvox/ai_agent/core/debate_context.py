@@ -0,0 +1,119 @@
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token)"""
+    return len(text) // 4 + 1 if text else 0
+
+def first_sentence(text):
+    """First sentence of a turn, used when no summarizer is available"""
+    return re.split(r'(?<=[.!?])\s', text.strip())[0]
+
+class DebateContext:
+    """
+    Rolling debate context for prompts: the last few turns verbatim plus an
+    incrementally updated summary of everything older, kept under a token
+    budget so prompt size stays flat however long the debate runs.
+    Summaries are updated in the background so a turn never waits on one;
+    evicted turns stay in the context verbatim until their summary lands.
+    """
+    def __init__(self, ai_model, recent_turns=4, token_budget=600, summary_words=120):
+        self.ai_model = ai_model
+        self.recent_turns = recent_turns
+        self.token_budget = token_budget
+        self.summary_words = summary_words
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debate-summary")
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all turns (start of a new debate)"""
+        with self._lock:
+            self.summary = ""
+            self.turns = deque()
+            self.folded_turns = 0
+            self.version = 0  # turns added so far; changes whenever a new turn is recorded
+            self._folding = []  # evicted turns with a summary update in flight
+            self._unfolded = []  # evicted turns waiting for the next update
+            self._fold_future = None
+            self._generation = getattr(self, "_generation", 0) + 1  # ignore folds from a previous debate
+
+    def add_turn(self, speaker, text, stage):
+        """Record a turn, handing the oldest turns to the background summarizer when needed"""
+        with self._lock:
+            self.turns.append({"speaker": speaker, "text": text, "stage": stage.value})
+            self.version += 1
+
+            while len(self.turns) > self.recent_turns:
+                self._unfolded.append(self.turns.popleft())
+            while len(self.turns) > 1 and estimate_tokens(self._render_recent()) > self.token_budget:
+                self._unfolded.append(self.turns.popleft())
+            self._schedule_fold()
+
+    def _schedule_fold(self):
+        """Start a summary update for every evicted turn unless one is already running (lock held)"""
+        if self._fold_future is not None or not self._unfolded:
+            return
+        # Turns evicted while an update runs are batched into the next one
+        self._folding, self._unfolded = self._unfolded, []
+        self._fold_future = self._executor.submit(self._fold, self._folding, self.summary, self._generation)
+
+    def _format_turn(self, turn):
+        return f"{turn['speaker']} ({turn['stage']}): {turn['text']}"
+
+    def _fold(self, turns, current_summary, generation):
+        """Merge evicted turns into the running summary (runs on the summarizer thread)"""
+        summary = None
+        try:
+            new_turns = "\n".join(self._format_turn(turn) for turn in turns)
+            prompt = f"""
+            Update the running summary of a debate with the new turns below.
+            Keep each side's key claims and any unanswered challenges.
+            Reply with the updated summary only, at most {self.summary_words} words.
+
+            Current summary:
+            {current_summary or "(none yet)"}
+
+            New turns:
+            {new_turns}
+            """
+            summary = self.ai_model.generate_response(prompt, max_tokens=self.summary_words * 2)
+        except Exception as e:
+            print(f"Error summarizing debate context: {e}")
+        if not summary:
+            # Summarizer unavailable: keep the first sentence of each turn instead
+            firsts = [f"{turn['speaker']}: {first_sentence(turn['text'])}" for turn in turns]
+            summary = " ".join(filter(None, [current_summary] + firsts))
+
+        # Hard cap so a runaway summary can never grow the prompt
+        words = summary.split()
+        summary = " ".join(words[-self.summary_words:]) if len(words) > self.summary_words else summary
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.summary = summary
+            self.folded_turns += len(turns)
+            self._folding = []
+            self._fold_future = None
+            self._schedule_fold()
+
+    def _render_recent(self):
+        """Summary plus the recent turns (what the token budget applies to)"""
+        return self._render(list(self.turns))
+
+    def _render(self, turns):
+        parts = []
+        if self.summary:
+            parts.append(f"Summary of the debate so far:\n{self.summary}")
+        if turns:
+            parts.append("Most recent turns:\n" + "\n".join(self._format_turn(turn) for turn in turns))
+        return "\n\n".join(parts)
+
+    def render(self):
+        """Context block to prepend to a turn prompt ('' when there is no history)"""
+        with self._lock:
+            # Turns still being summarised are sent verbatim so nothing drops out meanwhile
+            return self._render(self._folding + self._unfolded + list(self.turns))
@@ -1,16 +1,15 @@
-import whisper
-import sounddevice as sd
 import numpy as np
 import wave
 import os
 import re
-import torch
 import time
 import json
 import pygame
 from enum import Enum
-from gtts import gTTS
-import librosa
+from collections import deque
+from core.ai_model import AIModel
+from core.debate_context import DebateContext, estimate_tokens
+from core.speculation import Speculator
 
 class DebateMode(Enum):
     TEXT = "text"
@@ -22,8 +21,14 @@ class DebateStage(Enum):
     REBUTTAL_QUESTIONS = "rebuttal_questions"
     CLOSING = "closing"
 
+# Whisper, torch, sounddevice, gTTS and librosa are imported where they are
+# used, so text-only workers never load the voice stack
+
 class VoiceHandler:
     def __init__(self):
+        import torch
+        import whisper
+        
         self.temp_dir = "temp_audio"
         os.makedirs(self.temp_dir, exist_ok=True)
         
@@ -39,6 +44,8 @@ class VoiceHandler:
     
     def record_audio(self, duration=10, samplerate=16000):
         """Record audio from microphone and save to a temporary file"""
+        import sounddevice as sd
+        
         filename = os.path.join(self.temp_dir, f"recording_{int(time.time())}.wav")
         
         print("Recording... Speak now!")
@@ -96,6 +103,8 @@ class VoiceHandler:
     def text_to_speech(self, text):
         """Convert text to speech and play it"""
         try:
+            from gtts import gTTS
+            
             audio_file = os.path.join(self.temp_dir, f"tts_{int(time.time())}.mp3")
             tts = gTTS(text=text, lang='en', slow=False)
             tts.save(audio_file)
@@ -252,6 +261,8 @@ class VoiceAnalyzer:
     def analyze_audio(self, audio_file):
         """Analyze audio characteristics using librosa"""
         try:
+            import librosa
+            
             y, sr = librosa.load(audio_file, sr=None)
             duration = librosa.get_duration(y=y, sr=sr)
             
@@ -306,29 +317,6 @@ class DebateReportGenerator:
         # In a real implementation, this would create a more sophisticated report
         return debate_data
 
-class AIModel:
-    """Mock AI model for debate responses"""
-    def __init__(self, model_name="mock_model"):
-        self.model_name = model_name
-        print(f"Initializing AI Model: {model_name}")
-    
-    def generate_response(self, prompt):
-        """Generate AI response (mock implementation)"""
-        # In a real implementation, this would call a language model API
-        
-        # For testing, we'll generate some simple mock responses
-        if "opening" in prompt.lower():
-            return "This is a simulated AI opening statement. I would like to present three key arguments. First, evidence suggests this position has merit. Second, multiple studies confirm these findings. Third, we should consider the broader implications."
-        
-        elif "argument" in prompt.lower():
-            return "Here's my counterpoint: While that position has some validity, recent evidence suggests otherwise. Consider the following facts that challenge this assumption."
-        
-        elif "question" in prompt.lower():
-            return "How do you reconcile your position with the recent findings that suggest an alternative interpretation of the data?"
-        
-        else:
-            return "I acknowledge your points and would like to respond with a thoughtful consideration of the evidence presented."
-
 class DebateAgent:
     def __init__(self, ai_model, voice_mode=False):
         self.ai_model = ai_model
@@ -344,6 +332,19 @@ class DebateAgent:
         self.debate_history = []
         self.rebuttal_tracker = {"user": [], "ai": []}
         
+        # Bounded history sent with each AI turn prompt
+        self.context = DebateContext(ai_model)
+        
+        # Estimated output tokens generated vs. kept for the turns used, and
+        # tokens spent on speculation that was thrown away, per stage
+        self.token_usage = {}
+        
+        # AI turns pre-generated during idle time (e.g. while the previous AI turn is spoken)
+        self.speculator = Speculator()
+        
+        # AI rebuttal questions generated up front in one call
+        self.ai_question_queue = deque()
+        
         # Initialize pygame for audio playback if in voice mode
         if voice_mode and not pygame.mixer.get_init():
             pygame.mixer.init()
@@ -451,6 +452,10 @@ class DebateAgent:
     def _conduct_text_debate(self, topic, stance, rounds):
         opposite_stance = "Against" if stance == "For" else "For"
         self.debate_history = []
+        self.context.reset()
+        self.speculator.discard_all()
+        self.token_usage = {}
+        self.ai_question_queue.clear()
         
         # Opening argument from User
         print(f"\n=== OPENING STATEMENTS (max {self.word_limits[DebateStage.OPENING]} words) ===")
@@ -458,8 +463,9 @@ class DebateAgent:
         user_opening = self._enforce_word_limit(user_opening, self.word_limits[DebateStage.OPENING])
         self._add_to_history("User", user_opening, DebateStage.OPENING)
 
-        ai_opening = self._generate_ai_argument(topic, opposite_stance, DebateStage.OPENING)
-        print(f"\nAI Opening ({opposite_stance}):\n{ai_opening}")
+        print(f"\nAI Opening ({opposite_stance}):")
+        ai_opening = self._generate_ai_argument(topic, opposite_stance, DebateStage.OPENING, on_chunk=self._print_chunk)
+        print()
         self._add_to_history("AI", ai_opening, DebateStage.OPENING)
 
         # Main debate loop with alternating turns
@@ -472,12 +478,14 @@ class DebateAgent:
                 user_argument = self._enforce_word_limit(user_argument, self.word_limits[DebateStage.ARGUMENT])
                 self._add_to_history("User", user_argument, DebateStage.ARGUMENT)
                 
-                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT)
-                print(f"\nAI Argument:\n{ai_argument}")
+                print("\nAI Argument:")
+                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT, on_chunk=self._print_chunk)
+                print()
                 self._add_to_history("AI", ai_argument, DebateStage.ARGUMENT)
             else:  # AI goes first in even rounds
-                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT)
-                print(f"\nAI Argument:\n{ai_argument}")
+                print("\nAI Argument:")
+                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT, on_chunk=self._print_chunk)
+                print()
                 self._add_to_history("AI", ai_argument, DebateStage.ARGUMENT)
                 
                 print("\nYour Response (type 'f' to fact check last AI point):")
@@ -493,6 +501,7 @@ class DebateAgent:
         # Stage 3: Rebuttal Questions (post-debate)
         print(f"\n=== REBUTTAL QUESTIONS ===")
         rebuttal_questions = self._get_rebuttal_questions_count()
+        self._prefetch_ai_questions(topic, opposite_stance, rebuttal_questions // 2)
         
         for q in range(1, rebuttal_questions + 1):
             print(f"\n--- Rebuttal Question {q}/{rebuttal_questions} ---")
@@ -520,21 +529,29 @@ class DebateAgent:
     def _conduct_voice_debate(self, topic, stance, rounds):
         opposite_stance = "Against" if stance == "For" else "For"
         self.debate_history = []
+        self.context.reset()
+        self.speculator.discard_all()
+        self.token_usage = {}
+        self.ai_question_queue.clear()
         self.audio_clips = []
         self.rebuttal_tracker = {"user": [], "ai": []}
         
         # Stage 1: Opening Statements
         print(f"\n=== OPENING STATEMENTS ===")
-        ai_opening = self._generate_ai_argument(topic, opposite_stance, DebateStage.OPENING)
-        print(f"\nAI Opening Statement:\n{ai_opening}")
+        print("\nAI Opening Statement:")
+        ai_opening = self._generate_ai_argument(topic, opposite_stance, DebateStage.OPENING, on_chunk=self._print_chunk)
+        print()
+        
+        # Round 1 opens with another AI argument; record the opening first so
+        # it generates from the final context while the opening plays
+        self._add_to_history("AI", ai_opening, DebateStage.OPENING)
+        self._prefetch_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT, ("round", 1))
         
         # Play AI opening and show a clear indicator that speech is done
         print("\nPlaying AI opening statement...")
         self.voice_handler.text_to_speech(ai_opening)
         print("\n[AI has finished speaking]")
         
-        self._add_to_history("AI", ai_opening, DebateStage.OPENING)
-        
         print("\nSpeak your opening statement after the beep...")
         user_opening = self._get_voice_input(DebateStage.OPENING)
         if not user_opening:
@@ -547,9 +564,9 @@ class DebateAgent:
             # Alternate who goes first
             if round_num % 2 == 1:
                 # AI goes first in odd-numbered rounds
-                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT)
                 print("\nAI Argument:")
-                print(f"{ai_argument}")
+                ai_argument = self._generate_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT, on_chunk=self._print_chunk, slot=("round", round_num))
+                print()
                 
                 print("\nPlaying AI argument...")
                 self.voice_handler.text_to_speech(ai_argument)
@@ -582,11 +599,15 @@ class DebateAgent:
                 ai_response = self._generate_ai_response(user_argument, topic, opposite_stance)
                 print(f"\nAI Response:\n{ai_response}")
                 
+                # The next round opens with an AI argument; record first so it
+                # generates from the final context while this response plays
+                self._add_to_history("AI", ai_response, DebateStage.ARGUMENT)
+                if round_num < rounds:
+                    self._prefetch_ai_argument(topic, opposite_stance, DebateStage.ARGUMENT, ("round", round_num + 1))
+                
                 print("\nPlaying AI response...")
                 self.voice_handler.text_to_speech(ai_response)
                 print("\n[AI has finished speaking]")
-                
-                self._add_to_history("AI", ai_response, DebateStage.ARGUMENT)
 
         # Stage 3: Closing Arguments
         print(f"\n=== CLOSING ARGUMENTS ({self.time_limits[DebateStage.CLOSING]}s limit) ===")
@@ -597,8 +618,9 @@ class DebateAgent:
         
         self._add_to_history("User", user_close, DebateStage.CLOSING)
         
-        ai_close = self._generate_ai_argument(topic, opposite_stance, DebateStage.CLOSING)
-        print(f"\nAI Closing Statement:\n{ai_close}")
+        print("\nAI Closing Statement:")
+        ai_close = self._generate_ai_argument(topic, opposite_stance, DebateStage.CLOSING, on_chunk=self._print_chunk)
+        print()
         
         print("\nPlaying AI closing statement...")
         self.voice_handler.text_to_speech(ai_close)
@@ -608,6 +630,7 @@ class DebateAgent:
         
         # Stage 4: Rebuttal Questions (post-debate)
         rebuttal_questions = self._get_rebuttal_questions_count()
+        self._prefetch_ai_questions(topic, opposite_stance, rebuttal_questions // 2)
         print(f"\n=== REBUTTAL QUESTIONS ({rebuttal_questions}) ===")
         
         for q in range(1, rebuttal_questions + 1):
@@ -698,28 +721,173 @@ class DebateAgent:
             print("Let's try again...")
             return self._get_voice_input(stage)
 
-    def _generate_ai_argument(self, topic, stance, stage):
-        """Generate AI argument based on topic and stance"""
+    def _argument_prompt(self, topic, stance, stage):
+        """Prompt for an AI argument, including the current debate context"""
         # In a real implementation, this would call a better prompt
-        prompt = f"Generate a {stage.value} argument about '{topic}' from the {stance} perspective."
-        response = self.ai_model.generate_response(prompt)
-        
-        # Enforce word limits for consistency
-        words = response.split()
-        if len(words) > self.word_limits[stage]:
-            response = " ".join(words[:self.word_limits[stage]])
-            
+        return self._with_context(f"Generate a {stage.value} argument about '{topic}' from the {stance} perspective.")
+    
+    def _prefetch_ai_argument(self, topic, stance, stage, slot):
+        """
+        Start generating an upcoming AI argument. Only worth calling when no
+        turn will be recorded before it is needed (e.g. while the previous AI
+        turn plays); otherwise the result goes stale and is thrown away.
+        """
+        prompt = self._argument_prompt(topic, stance, stage)
+        self.speculator.start(
+            ("argument", slot),
+            lambda cancelled: self._stream_with_word_limit(prompt, stage, cancelled=cancelled),
+            self.context.version,
+            on_discard=lambda result: self._record_discarded_tokens(stage, result[1])
+        )
+    
+    def _generate_ai_argument(self, topic, stance, stage, on_chunk=None, slot=None):
+        """Generate AI argument based on topic and stance"""
+        # Use the pre-generated argument only if it was built from the current context
+        if slot is not None:
+            response, received = self.speculator.take(("argument", slot), self.context.version) or ("", "")
+            if response:
+                self._record_token_usage(stage, received, response)
+                if on_chunk:
+                    on_chunk(response)
+                return response
+        
+        prompt = self._argument_prompt(topic, stance, stage)
+        
+        # Stream so the argument can be shown as it arrives; the word limit
+        # is enforced on the stream and stops generation once reached
+        response, received = self._stream_with_word_limit(prompt, stage, on_chunk)
+        self._record_token_usage(stage, received, response)
+        if not response:
+            response = self._generate_fallback_response(topic, stance, stage.value)
+            if on_chunk:
+                on_chunk(response)
         return response
     
+    def _token_budget(self, stage):
+        """Output token budget for a stage, derived from its word limit"""
+        # ~1.33 tokens per English word, plus headroom to finish the last sentence
+        return int(self.word_limits[stage] * 1.5) + 16
+    
+    def _stream_with_word_limit(self, prompt, stage, on_chunk=None, cancelled=None):
+        """
+        Collect a streamed response, stopping after the stage's word limit or
+        once `cancelled` (a threading.Event) is set.
+        Returns (kept text, all text received).
+        """
+        limit = self.word_limits[stage]
+        # Near the limit, only emit whole sentences so the final
+        # sentence-boundary trim never retracts text already shown
+        hold_from = int(limit * 0.75)
+        received = ""
+        text = ""
+        emitted = 0
+        stream = self.ai_model.stream_response(prompt, max_tokens=self._token_budget(stage))
+        try:
+            for chunk in stream:
+                if cancelled is not None and cancelled.is_set():
+                    break
+                received += chunk
+                text += chunk
+                words = list(re.finditer(r'\S+', text))
+                # Only cut once a word past the limit has started, so the
+                # last allowed word is never split across chunks
+                if len(words) > limit:
+                    text = text[:words[limit - 1].end()]
+                    break
+                if on_chunk:
+                    safe = len(text) if len(words) < hold_from else self._last_sentence_end(text)
+                    if safe > emitted:
+                        on_chunk(text[emitted:safe])
+                        emitted = safe
+        finally:
+            stream.close()
+        
+        text = self._trim_to_sentence(text, emitted)
+        if on_chunk and len(text) > emitted:
+            on_chunk(text[emitted:])
+        
+        return text.strip(), received
+    
+    def _last_sentence_end(self, text):
+        """Index just past the last complete sentence in text (0 if none)"""
+        ends = [m.end() for m in re.finditer(r'[.!?]["\')\]]*(?=\s|$)', text)]
+        return ends[-1] if ends else 0
+    
+    def _trim_to_sentence(self, text, emitted=0):
+        """Drop a trailing partial sentence, unless that would lose too much"""
+        end = self._last_sentence_end(text)
+        if end >= max(emitted, len(text) // 2, 1):
+            return text[:end]
+        return text
+    
+    def _stage_usage(self, stage):
+        return self.token_usage.setdefault(stage.value, {"generated": 0, "kept": 0, "discarded": 0})
+    
+    def _record_token_usage(self, stage, generated, kept):
+        """Track (estimated) tokens generated vs. kept per stage, for turns actually used"""
+        usage = self._stage_usage(stage)
+        usage["generated"] += estimate_tokens(generated)
+        usage["kept"] += estimate_tokens(kept.strip())
+    
+    def _record_discarded_tokens(self, stage, generated):
+        """Track (estimated) tokens spent on speculation that was thrown away"""
+        self._stage_usage(stage)["discarded"] += estimate_tokens(generated)
+    
+    def _print_chunk(self, chunk):
+        """Print a streamed chunk without waiting for the full response"""
+        print(chunk, end="", flush=True)
+    
     def _generate_ai_response(self, user_input, topic, stance):
         """Generate AI response to user input"""
-        prompt = f"Respond to this point in a debate about '{topic}' from the {stance} perspective: '{user_input}'"
-        return self.ai_model.generate_response(prompt)
+        prompt = self._with_context(f"Respond to this point in a debate about '{topic}' from the {stance} perspective: '{user_input}'")
+        response = self.ai_model.generate_response(prompt)
+        return response or self._generate_fallback_response(topic, stance, "response")
+    
+    def _with_context(self, instruction):
+        """Prefix a turn instruction with the rolling debate context"""
+        context = self.context.render()
+        if not context:
+            return instruction
+        return f"{context}\n\n{instruction}"
     
     def _generate_ai_question(self, topic, stance):
         """Generate AI question for rebuttal phase"""
+        # Serve from the batch generated when the rebuttal phase started
+        if not self.ai_question_queue:
+            self.ai_question_queue.extend(self.speculator.take("rebuttal_questions") or [])
+        if self.ai_question_queue:
+            return self.ai_question_queue.popleft()
+        
+        # Batch unavailable or unparsable: generate this question on its own
         prompt = f"Generate a challenging question about '{topic}' from the {stance} perspective."
-        return self.ai_model.generate_response(prompt)
+        response = self.ai_model.generate_response(prompt, max_tokens=self._token_budget(DebateStage.REBUTTAL_QUESTIONS))
+        return response or self._generate_fallback_response(topic, stance, "question")
+    
+    def _prefetch_ai_questions(self, topic, stance, count):
+        """Start generating every AI rebuttal question in one background call"""
+        if count > 0:
+            self.speculator.start("rebuttal_questions", lambda cancelled: self._generate_ai_questions(topic, stance, count))
+    
+    def _generate_ai_questions(self, topic, stance, count):
+        """Generate `count` distinct rebuttal questions with a single structured call"""
+        prompt = f"""
+        Generate exactly {count} distinct, challenging rebuttal questions about '{topic}' from the {stance} perspective.
+        Each question must be under {self.word_limits[DebateStage.REBUTTAL_QUESTIONS]} words.
+        Return ONLY a valid JSON array of strings, for example: ["First question?", "Second question?"]
+        """
+        max_tokens = count * self._token_budget(DebateStage.REBUTTAL_QUESTIONS) + 32
+        schema = {"type": "array", "items": {"type": "string"}}
+        questions = self.ai_model.generate_json(prompt, schema, max_tokens=max_tokens, expect=list) or []
+        return [q.strip() for q in questions if isinstance(q, str) and q.strip()][:count]
+    
+    def _generate_fallback_response(self, topic, stance, kind):
+        """Canned reply used when the model is failing or the circuit is open"""
+        print("Using fallback response")
+        if kind == "question":
+            return f"What is the strongest evidence you can offer for your position on '{topic}'?"
+        if kind == "response":
+            return f"I disagree with that point. Speaking {stance} the motion on '{topic}', the evidence does not support that conclusion."
+        return f"Speaking {stance} the motion on '{topic}', I maintain that the benefits and risks have not been weighed fairly, and the burden of proof remains with my opponent."
     
     def _handle_fact_check(self, statement):
         """Perform fact checking on AI statement"""
@@ -751,15 +919,18 @@ class DebateAgent:
                 self.rebuttal_tracker["ai"].append(text)
                 
         self.debate_history.append(entry)
+        self.context.add_turn(speaker, text, stage)
     
     def _early_exit(self):
         """Handle early exit from debate"""
         print("\nDebate ended early.")
+        self.speculator.discard_all()
         return {"status": "incomplete", "reason": "user_exit", "history": self.debate_history}
     
     def _generate_final_report(self, topic, stance, rounds):
         """Generate final debate report"""
         print("\nGenerating debate report...")
+        self.speculator.discard_all()
         
         # Calculate basic statistics
         user_words = sum(entry["word_count"] for entry in self.debate_history if entry["speaker"] == "User")
@@ -792,6 +963,10 @@ class DebateAgent:
                 "user_questions": self.rebuttal_tracker["user"],
                 "ai_questions": self.rebuttal_tracker["ai"]
             },
+            "token_usage": {
+                stage: dict(usage, kept_ratio=round(usage["kept"] / usage["generated"], 2) if usage["generated"] else 0)
+                for stage, usage in self.token_usage.items()
+            },
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         }
         
@@ -859,8 +1034,8 @@ def main():
     print("\n=== AI Debate Assistant ===")
     print("This program helps you practice debating against an AI opponent")
     
-    # Initialize AI model
-    ai_model = AIModel()
+    # Initialize AI model (offline simulated backend unless AI_MODEL_BACKEND says otherwise)
+    ai_model = AIModel(backend=os.getenv("AI_MODEL_BACKEND", "simulated"))
     
     # Initialize pygame for audio playback
     try:
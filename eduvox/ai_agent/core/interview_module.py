@@ -1,40 +1,225 @@
 #interview_module.py
 from core.int_report_generator import InterviewReportGenerator
-import google.generativeai as genai
+from core.ai_model import get_default_model
+from core.resume_cache import ResumeCache, get_resume_cache
+from core.resume_sections import segment_sections
+from core.ocr_preprocess import get_preprocessor
+from core.question_bank import get_question_bank
+from core.interview_session import InterviewSession
+from core.skill_matcher import extract_skills, merge_skills
 import os
-import json
 import re
 import sys
-from pdf2image import convert_from_path
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
-import spacy
-import easyocr
-import numpy as np
 
-# Initialize EasyOCR reader for English (set gpu=True if you have a GPU)
-reader = easyocr.Reader(['en'], gpu=False)
+# ----------------- OCR Reader -----------------
+
+# The EasyOCR reader loads hundreds of MB of weights, so it is created on
+# first use (or by warmup_ocr) instead of at import time
+_reader = None
+_reader_lock = threading.Lock()
+_readtext_lock = threading.Lock()
+
+def get_reader():
+    """Process-wide EasyOCR reader for English, created on first use"""
+    global _reader
+    if _reader is None:
+        with _reader_lock:
+            if _reader is None:
+                import easyocr
+                # Set gpu=True if you have a GPU
+                _reader = easyocr.Reader(['en'], gpu=os.getenv("OCR_GPU", "0") == "1")
+    return _reader
+
+def warmup_ocr():
+    """
+    Load the OCR models ahead of the first request (e.g. in a worker's
+    post-fork hook): in this process, which OCRs uploaded images, and in
+    every OCR pool worker, which OCR PDF pages
+    """
+    get_reader()
+    workers = ocr_workers()
+    if workers > 1:
+        pool = get_ocr_pool()
+        # One task per worker makes the pool start them all, each loading its reader
+        for future in [pool.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+
+def ocr_readtext(image_np):
+    """Run OCR on an image array; calls are serialised so request threads can share one reader"""
+    reader = get_reader()
+    with _readtext_lock:
+        return reader.readtext(image_np, detail=0, paragraph=True)
 
 # ----------------- Resume Analysis Functions -----------------
 
+def _init_ocr_worker():
+    """Pool worker initializer: load the reader before the first page arrives"""
+    try:
+        get_reader()
+    except Exception as e:
+        # Leave the pool usable; the page task will report the error
+        print(f"Error loading OCR reader in worker: {e}")
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def ocr_workers():
+    """Number of OCR worker processes (OCR_WORKERS, default: one per core)"""
+    return max(1, int(os.getenv("OCR_WORKERS", os.cpu_count() or 1)))
+
+def get_ocr_pool():
+    """Process pool reused across requests so each worker loads its reader once"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # spawn: forking a threaded web server is not safe
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=ocr_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker
+            )
+        return _ocr_pool
+
+def ocr_image(image):
+    """Preprocess a PIL image and OCR it; blank pages are skipped"""
+    pixels = get_preprocessor().process(image)
+    if pixels is None:
+        return ""
+    return "\n".join(ocr_readtext(pixels))
+
+def ocr_pdf_page(pdf_path, page_number):
+    """Render a single PDF page and OCR it (runs inside a pool worker)"""
+    preprocessor = get_preprocessor()
+    pages = convert_from_path(pdf_path, dpi=preprocessor.dpi, first_page=page_number, last_page=page_number,
+                              grayscale=preprocessor.grayscale)
+    if not pages:
+        return ""
+    return ocr_image(pages[0])
+
+def iter_pdf_page_texts(pdf_path, workers=None, pages=None):
+    """
+    Yield (page_number, text) in page order, for all pages or only `pages`.
+    Pages are rendered and OCR'd one at a time inside the workers, with at
+    most 2 x workers pages in flight, so peak memory does not grow with the
+    page count.
+    """
+    if pages is None:
+        pages = range(1, pdfinfo_from_path(pdf_path)["Pages"] + 1)
+    pages = deque(pages)
+    workers = workers or ocr_workers()
+    
+    if workers == 1:
+        for page_number in pages:
+            yield page_number, ocr_pdf_page(pdf_path, page_number)
+        return
+    
+    pool = get_ocr_pool()
+    in_flight = deque()
+    while pages or in_flight:
+        while pages and len(in_flight) < workers * 2:
+            page_number = pages.popleft()
+            in_flight.append((page_number, pool.submit(ocr_pdf_page, pdf_path, page_number)))
+        page_number, future = in_flight.popleft()
+        yield page_number, future.result()
+
 def extract_text_from_pdf(pdf_path):
     """
     Converts PDF pages to images and applies OCR (using EasyOCR) to extract text.
+    Pages are processed in parallel across a process pool (OCR_WORKERS).
     Requires Poppler installed and in your system PATH.
     """
+    parts = []
     try:
-        pages = convert_from_path(pdf_path)
+        for page_number, page_text in iter_pdf_page_texts(pdf_path):
+            parts.append(f"\n--- Page {page_number} ---\n{page_text}")
     except Exception as e:
         print(f"Error converting PDF: {e}")
-        return ""
+        return "".join(parts)
+    return "".join(parts)
+
+def extract_text_layer(pdf_path):
+    """
+    Read the embedded text layer of each page with pypdf (no rendering or OCR).
+    Returns a list of page texts, or None when pypdf is missing or the file can't be parsed.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    try:
+        return [page.extract_text() or "" for page in PdfReader(pdf_path).pages]
+    except Exception as e:
+        print(f"Error reading PDF text layer: {e}")
+        return None
+
+def is_usable_text(text):
+    """
+    Whether a page's text layer is worth keeping: enough characters
+    (PDF_TEXT_MIN_CHARS) and mostly readable, since broken font encodings come
+    out as (cid:NN) runs or control characters.
+    """
+    stripped = text.strip()
+    if len(stripped) < int(os.getenv("PDF_TEXT_MIN_CHARS", 40)):
+        return False
+    if "(cid:" in stripped:
+        return False
+    readable = sum(1 for c in stripped if c.isalnum() or c.isspace() or c in ".,;:-()&/@+%'\"•")
+    return readable / len(stripped) >= 0.85
+
+def read_pdf_text_layer(pdf_path):
+    """
+    Text-layer pass of extract_pdf_text: (usable page texts by page number,
+    pages that still need OCR, page count), or None if there is no text layer.
+    """
+    layer = extract_text_layer(pdf_path)
+    if not layer:
+        return None
+    page_texts = {i + 1: text for i, text in enumerate(layer) if is_usable_text(text)}
+    ocr_pages = [n for n in range(1, len(layer) + 1) if n not in page_texts]
+    return page_texts, ocr_pages, len(layer)
+
+def complete_pdf_text(pdf_path, page_texts, ocr_pages, page_count):
+    """OCR pass of extract_pdf_text: fill in ocr_pages and join. Returns (text, method)"""
+    page_texts = dict(page_texts)
+    if ocr_pages:
+        try:
+            page_texts.update(iter_pdf_page_texts(pdf_path, pages=ocr_pages))
+        except Exception as e:
+            print(f"Error converting PDF: {e}")
     
-    text = ""
-    for i, page in enumerate(pages):
-        # Convert PIL image to numpy array for EasyOCR
-        page_np = np.array(page)
-        page_text_list = reader.readtext(page_np, detail=0, paragraph=True)
-        page_text = "\n".join(page_text_list)
-        text += f"\n--- Page {i+1} ---\n" + page_text
-    return text
+    if not ocr_pages:
+        method = "text_layer"
+    elif len(ocr_pages) == page_count:
+        method = "ocr"
+    else:
+        method = "mixed"
+    print(f"PDF text extracted via {method} ({len(ocr_pages)}/{page_count} pages OCR'd)")
+    
+    text = "".join(
+        f"\n--- Page {n} ---\n{page_texts.get(n, '')}" for n in range(1, page_count + 1)
+    )
+    return text, method
+
+def extract_pdf_text(pdf_path):
+    """
+    Extract text from a PDF, using the embedded text layer where it is usable
+    and OCR only for the remaining (scanned or garbled) pages.
+    Returns (text, method) with method "text_layer", "ocr" or "mixed".
+    """
+    layer = read_pdf_text_layer(pdf_path)
+    if layer is None:
+        return extract_text_from_pdf(pdf_path), "ocr"
+    return complete_pdf_text(pdf_path, *layer)
+
+def ocr_image_file(image_path):
+    """OCR an image file; picklable, so it can run in the OCR process pool"""
+    return ocr_image(Image.open(image_path))
 
 def extract_text_from_image(image_path):
     """
@@ -42,9 +227,7 @@ def extract_text_from_image(image_path):
     """
     try:
         image = Image.open(image_path)
-        image_np = np.array(image)
-        text_list = reader.readtext(image_np, detail=0, paragraph=True)
-        text = "\n".join(text_list)
+        text = ocr_image(image)
         print("Extracted Text:\n", text)
         return text
     except Exception as e:
@@ -53,36 +236,43 @@ def extract_text_from_image(image_path):
 
 def extract_sections(text):
     """
-    Uses regex patterns to extract sections like skills, achievements, and experience.
-    This version checks for all instances and combines them.
-    Adjust or expand the patterns as needed to suit different resume formats.
+    Splits the text into sections like skills, achievements, and experience.
+    All instances of a section are combined. Extend the header vocabulary with
+    get_segmenter().add_headers(...) to suit different resume formats.
     """
-    sections = {}
-    patterns = {
-        'skills': r'(?:Skills|Technical Skills|Areas of Expertise|Core Competencies|Proficiencies|Abilities|skits|skis)[:\n]*(.*?)(?=\n[A-Z]|\Z)',
-        'achievements': r'(?:Achievements|Accomplishments|Awards|Honors)[:\n]*(.*?)(?=\n[A-Z]|\Z)',
-        'experience': r'(?:Experience|Work Experience|Professional Experience|Employment History|Work History)[:\n]*(.*?)(?=\n[A-Z]|\Z)'
-    }
-    
-    for section, pattern in patterns.items():
-        # Find all instances of the pattern
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-        if matches:
-            # Clean and combine all instances
-            combined = "\n".join(match.strip() for match in matches if match.strip())
-            sections[section] = combined
+    sections = segment_sections(text)
     print("Extracted Sections:", sections)
     return sections
 
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    Process-wide spaCy pipeline, loaded once with everything but NER disabled.
+    Returns None if the model isn't installed.
+    """
+    global _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            try:
+                import spacy
+                nlp = spacy.load("en_core_web_sm")
+                # Only entities are used; keep tok2vec in case NER listens to it
+                nlp.select_pipes(disable=[name for name in nlp.pipe_names if name not in ("tok2vec", "ner")])
+                _nlp = nlp
+            except Exception as e:
+                print("spaCy model not found. Please install 'en_core_web_sm' by running:")
+                print("python -m spacy download en_core_web_sm")
+                _nlp = False
+        return _nlp or None
+
 def perform_named_entity_recognition(text):
     """
     Uses spaCy to extract named entities from the text.
     """
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except Exception as e:
-        print("spaCy model not found. Please install 'en_core_web_sm' by running:")
-        print("python -m spacy download en_core_web_sm")
+    nlp = get_nlp()
+    if nlp is None:
         return []
     doc = nlp(text)
     entities = [(ent.text, ent.label_) for ent in doc.ents]
@@ -90,24 +280,37 @@ def perform_named_entity_recognition(text):
 
 # ----------------- Interview Agent -----------------
 
+# Response schemas for Gemini's structured output mode
+RESUME_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "experience": {"type": "string"},
+        "achievements": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["skills", "experience", "achievements"]
+}
+
+INTERVIEW_QUESTIONS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "text": {"type": "string"},
+            "difficulty": {"type": "string"},
+            "skills": {"type": "array", "items": {"type": "string"}}
+        },
+        "required": ["text"]
+    }
+}
+
 class InterviewAgent:
-    def __init__(self, ai_model=None):
-        # Initialize Gemini API with proper configuration
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not found")
-        
-        genai.configure(api_key=api_key)
-        try:
-            # Use the correct model name - gemini-2.0-flash
-            model_name = "gemini-2.0-flash"
-            print(f"Using model: {model_name}")
-            self.model = genai.GenerativeModel(model_name)
-            test_response = self.model.generate_content("Test")
-            print("Gemini API connected successfully!")
-        except Exception as e:
-            print(f"Error initializing Gemini: {e}")
-            self.model = None
+    def __init__(self, ai_model=None, resume_cache=None, question_bank=None):
+        # Share the process-wide client; retries, rate limiting and the
+        # connectivity check all live there instead of per interview
+        self.ai_model = ai_model or get_default_model()
+        self.resume_cache = resume_cache or get_resume_cache()
+        self.question_bank = question_bank or get_question_bank()
         
         self.report_generator = InterviewReportGenerator()
         self.skills = None
@@ -115,12 +318,13 @@ class InterviewAgent:
         self.experience = None
         self.difficulty = None
         self.responses = []
+        self.extraction_method = None
 
     def analyze_resume_with_gemini(self, resume_text):
         """
         Uses Gemini API to analyze resume text and extract skills, experience, and achievements.
         """
-        if not self.model:
+        if not self.ai_model.available:
             print("Gemini API not available. Falling back to regex extraction.")
             return None
         
@@ -143,25 +347,16 @@ class InterviewAgent:
             }}
             """
             
-            response = self.model.generate_content(analysis_prompt)
             print("Analyzing resume with Gemini...")
+            resume_data = self.ai_model.generate_json(
+                analysis_prompt, RESUME_ANALYSIS_SCHEMA, max_tokens=2048, expect=dict
+            )
             
-            # Extract JSON from response
-            raw_response = response.text
-            json_match = re.search(r'{.*}', raw_response, re.DOTALL)
-            
-            if json_match:
-                json_str = json_match.group(0)
-                try:
-                    resume_data = json.loads(json_str)
-                    print("Successfully parsed resume data with Gemini!")
-                    return resume_data
-                except json.JSONDecodeError as e:
-                    print(f"JSON parse error: {e}")
-                    return None
-            else:
-                print("No valid JSON found in Gemini response")
-                return None
+            if resume_data:
+                print("Successfully parsed resume data with Gemini!")
+                return resume_data
+            print("No valid JSON found in Gemini response")
+            return None
                 
         except Exception as e:
             print(f"Error analyzing resume with Gemini: {e}")
@@ -181,38 +376,43 @@ class InterviewAgent:
         if os.path.exists(resume_path):
             ext = os.path.splitext(resume_path)[1].lower()
             
+            # Same file bytes and model as a previous upload: reuse its text and analysis
+            cache_key = ResumeCache.make_key(resume_path, self.ai_model.model_name)
+            cached = self.resume_cache.get(cache_key)
+            if cached and cached["analysis"]:
+                print("Resume found in cache, skipping extraction and analysis.")
+                self.extraction_method = "cache"
+                analysis = cached["analysis"]
+                self.skills = analysis.get('skills', [])
+                self.experience = analysis.get('experience', "")
+                return {
+                    "job_profile": job_profile,
+                    "skills": self.skills,
+                    "experience": self.experience,
+                    "achievements": analysis.get('achievements', [])
+                }
+            
             text = ""
-            if ext == '.pdf':
+            if cached:
+                text = cached["text"]
+                self.extraction_method = "cache"
+            elif ext == '.pdf':
                 print("Processing PDF resume...")
-                text = extract_text_from_pdf(resume_path)
+                text, self.extraction_method = extract_pdf_text(resume_path)
             elif ext in ['.jpg', '.jpeg', '.png', '.tiff']:
                 print("Processing image resume...")
                 text = extract_text_from_image(resume_path)
+                self.extraction_method = "ocr"
             else:
                 print("Unsupported file format for resume extraction.")
             
             if text:
-                # Use Gemini for analysis if available
-                gemini_analysis = self.analyze_resume_with_gemini(text)
-                
-                if gemini_analysis:
-                    # Extract data from Gemini analysis
-                    resume_skills = gemini_analysis.get('skills', [])
-                    resume_experience = gemini_analysis.get('experience', "")
-                    resume_achievements = gemini_analysis.get('achievements', [])
-                else:
-                    # Fallback to regex-based extraction
-                    sections = extract_sections(text)
-                    if 'skills' in sections:
-                        resume_skills = [skill.strip() for skill in re.split(r',|;|\n', sections['skills']) if skill.strip()]
-                    if 'experience' in sections:
-                        resume_experience = sections['experience']
-                    if 'achievements' in sections:
-                        resume_achievements = [
-                            achievement.strip() 
-                            for achievement in re.split(r'•|\*|\-|\n', sections['achievements']) 
-                            if achievement.strip()
-                        ]
+                fields, gemini_analysis = self.analyze_resume_text(text)
+                # Only Gemini-backed results are cached, so a later upload can still get them
+                self.resume_cache.set(cache_key, text, fields if gemini_analysis else None, self.extraction_method)
+                resume_skills = fields['skills']
+                resume_experience = fields['experience']
+                resume_achievements = fields['achievements']
         
         # Store the extracted information
         self.skills = resume_skills
@@ -225,6 +425,43 @@ class InterviewAgent:
             "achievements": resume_achievements
         }
 
+    def analyze_resume_text(self, text):
+        """
+        Skills, experience and achievements from resume text.
+        Skills come from the taxonomy matcher over the whole text. Gemini, when
+        available and RESUME_GEMINI_ENRICH isn't 0, adds skills the taxonomy
+        lacks plus experience and achievements; otherwise regex sections do.
+        Returns (fields, gemini_analysis); gemini_analysis is None without Gemini.
+        """
+        taxonomy_skills = extract_skills(text)
+        
+        # Use Gemini for analysis if available
+        gemini_analysis = None
+        if os.getenv("RESUME_GEMINI_ENRICH", "1") != "0":
+            gemini_analysis = self.analyze_resume_with_gemini(text)
+        if gemini_analysis:
+            # Extract data from Gemini analysis
+            return {
+                "skills": merge_skills(taxonomy_skills, gemini_analysis.get('skills', [])),
+                "experience": gemini_analysis.get('experience', ""),
+                "achievements": gemini_analysis.get('achievements', [])
+            }, gemini_analysis
+        
+        # Fallback to regex-based extraction
+        fields = {"skills": taxonomy_skills, "experience": "", "achievements": []}
+        sections = extract_sections(text)
+        if 'skills' in sections and not taxonomy_skills:
+            fields['skills'] = [skill.strip() for skill in re.split(r',|;|\n', sections['skills']) if skill.strip()]
+        if 'experience' in sections:
+            fields['experience'] = sections['experience']
+        if 'achievements' in sections:
+            fields['achievements'] = [
+                achievement.strip() 
+                for achievement in re.split(r'•|\*|\-|\n', sections['achievements']) 
+                if achievement.strip()
+            ]
+        return fields, None
+
     def select_difficulty_level(self):
         """Select interview difficulty"""
         print("\nInterview Difficulty Levels:")
@@ -254,9 +491,20 @@ class InterviewAgent:
         elif difficulty == "Senior":
             question_count = 8
 
+        # Serve what we can from the question bank; only the gap goes to Gemini
+        banked = self.question_bank.find(job_profile, self.difficulty, self.skills, limit=question_count)
+        gap = question_count - len(banked)
+        if not gap:
+            print(f"Served {len(banked)} questions from the question bank")
+            return banked
+        
+        avoid = ""
+        if banked:
+            avoid = "Do not repeat any of these questions:\n" + "\n".join(f"- {q['text']}" for q in banked)
+
         # Modified prompt to be more explicit about the JSON format
         prompt = f"""
-        Create exactly {question_count} interview questions for a {job_profile} position.
+        Create exactly {gap} interview questions for a {job_profile} position.
         Skills required: {', '.join(self.skills)}
         Experience: {self.experience} years
         Level: {self.difficulty}
@@ -274,65 +522,45 @@ class InterviewAgent:
         ]
         
         The output MUST be valid JSON that can be parsed with json.loads().
+        {avoid}
         """
         
-        if not self.model:
-            return self._generate_fallback_questions(job_profile, self.difficulty)
+        if not self.ai_model.available:
+            return self._fill_with_fallback_questions(banked, job_profile, question_count)
 
         try:
-            response = self.model.generate_content(prompt)
             print("Generating questions...")
-            
-            # Get the raw response text
-            raw_response = response.text
-            print("DEBUG - Raw API response:")
-            print(raw_response[:200] + "..." if len(raw_response) > 200 else raw_response)
-            
-            # Clean the response to extract valid JSON
-            # Extract JSON array from response using regex
-            json_match = re.search(r'\[\s*{.*}\s*\]', raw_response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                try:
-                    questions = json.loads(json_str)
-                    print(f"Successfully parsed {len(questions)} questions!")
-                except json.JSONDecodeError as e:
-                    print(f"JSON parse error: {e}")
-                    return self._generate_fallback_questions(job_profile, self.difficulty)
-            else:
-                # Alternative approach: try finding all objects and building array
-                print("Trying alternative parsing method...")
-                try:
-                    # Clean up common formatting issues
-                    cleaned = re.sub(r'```json\s*|\s*```', '', raw_response)  # Remove markdown code blocks
-                    cleaned = re.sub(r'^\s*\[\s*|\s*\]\s*$', '', cleaned)  # Remove outer brackets
-                    objects = re.findall(r'{[^{}]*}', cleaned)
-                    
-                    if objects:
-                        # Reconstruct JSON array
-                        json_str = "[" + ",".join(objects) + "]"
-                        questions = json.loads(json_str)
-                        print(f"Alternative parsing successful! Found {len(questions)} questions.")
-                    else:
-                        raise ValueError("No JSON objects found")
-                except Exception as e:
-                    print(f"Alternative parsing failed: {e}")
-                    return self._generate_fallback_questions(job_profile, self.difficulty)
+            # JSON mode with a schema; a truncated array still yields its complete questions
+            questions = self.ai_model.generate_json(
+                prompt, INTERVIEW_QUESTIONS_SCHEMA, max_tokens=2048, expect=list
+            )
             
             # Process the questions
             formatted_questions = []
-            for q in questions[:question_count]:
-                formatted_questions.append({
-                    'text': q['text'],
-                    'difficulty': self.difficulty,
-                    'skills': q.get('skills', [])
-                })
+            for q in (questions or [])[:gap]:
+                if isinstance(q, dict) and q.get('text'):
+                    formatted_questions.append({
+                        'text': q['text'],
+                        'difficulty': self.difficulty,
+                        'skills': q.get('skills', [])
+                    })
             
-            return formatted_questions
+            if not formatted_questions:
+                print("No valid questions found in Gemini response")
+                return self._fill_with_fallback_questions(banked, job_profile, question_count)
+            print(f"Successfully parsed {len(formatted_questions)} questions!")
+            self.question_bank.add(formatted_questions, job_profile)
+            return banked + formatted_questions
             
         except Exception as e:
             print(f"Error generating questions: {e}")
-            return self._generate_fallback_questions(job_profile, self.difficulty)
+            return self._fill_with_fallback_questions(banked, job_profile, question_count)
+
+    def _fill_with_fallback_questions(self, banked, job_profile, question_count):
+        """Top up banked questions with fallback ones, which are also recorded in the bank"""
+        fallback = self._generate_fallback_questions(job_profile, self.difficulty)
+        self.question_bank.add(fallback, job_profile, source="fallback")
+        return (banked + fallback)[:question_count]
 
     def _generate_fallback_questions(self, job_profile, difficulty):
         """Generate basic questions if Gemini API fails"""
@@ -400,73 +628,22 @@ class InterviewAgent:
         
         return questions
 
+    def start_session(self, candidate_info, difficulty, questions):
+        """Turn-based interview; answers are scored in the background as they are submitted"""
+        return InterviewSession(self, candidate_info, difficulty, questions)
+
     def conduct_interview(self, candidate_info, difficulty, questions):
         """Conduct interview and collect responses"""
-        interview_history = []
-        
         print(f"\n=== {difficulty} Level Interview for {candidate_info['job_profile']} ===")
         
+        session = self.start_session(candidate_info, difficulty, questions)
         for i, question in enumerate(questions, 1):
             print(f"\nQuestion {i}: {question['text']}")
-            response = input("Your Answer: ").strip()
-            
-            interview_history.append({
-                "question": question['text'],
-                "response": response,
-                "expected_skills": question.get('skills', [])
-            })
-            self.responses.append({"question": question['text'], "answer": response})
+            session.submit_answer(input("Your Answer: "))
         
-        # Generate interview report with AI analysis
-        report = self.analyze_and_generate_report(candidate_info, difficulty, interview_history)
-        return report
+        # Earlier answers were scored while later ones were being typed
+        return session.finish()
     
-    def analyze_and_generate_report(self, candidate_info, difficulty, interview_history):
-        """Analyze responses using Gemini and generate report"""
-        # Include achievements in analysis if available
-        achievements_text = ""
-        if 'achievements' in candidate_info and candidate_info['achievements']:
-            achievements_text = f"- Notable Achievements: {chr(10)}  " + f"{chr(10)}  ".join([
-                f"• {achievement}" for achievement in candidate_info['achievements'][:3]
-            ])
-        
-        analysis_prompt = f"""
-        Analyze these interview responses for a {candidate_info['job_profile']} position:
-        
-        Candidate Profile:
-        - Skills: {', '.join(self.skills)}
-        - Experience: {self.experience} years
-        - Difficulty Level: {self.difficulty}
-        {achievements_text}
-        
-        Q&A:
-        {chr(10).join([f"Q: {q['question']}{chr(10)}A: {q['response']}" for q in interview_history])}
-        
-        Provide analysis covering:
-        -Technical knowledge depth
-        -Problem-solving approach
-        -Communication clarity
-        -Skill validation
-        -Improvement suggestions
-        -Overall suitability
-        
-        Format in clear sections with bullet points.
-        """
-        
-        try:
-            analysis = self.model.generate_content(analysis_prompt)
-            ai_analysis = analysis.text
-        except Exception as e:
-            print(f"Error generating analysis: {e}")
-            ai_analysis = "Could not generate analysis due to technical error"
-
-        return self.report_generator.generate_interview_report(
-            candidate_info,
-            difficulty,
-            interview_history,
-            ai_analysis
-        )
-
     def run_interview(self, data, resume_path):
         """
         Execute the complete interview process.
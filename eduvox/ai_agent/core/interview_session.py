@@ -0,0 +1,187 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ANSWER_EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "strengths": {"type": "string"},
+        "improvements": {"type": "string"},
+        "skills_demonstrated": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["score", "strengths", "improvements"]
+}
+
+_scoring_executor = None
+_scoring_executor_lock = threading.Lock()
+
+def _get_scoring_executor():
+    """Threads shared by every session for background answer scoring"""
+    global _scoring_executor
+    with _scoring_executor_lock:
+        if _scoring_executor is None:
+            _scoring_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("INTERVIEW_SCORING_WORKERS", 4)),
+                thread_name_prefix="score"
+            )
+        return _scoring_executor
+
+class InterviewSession:
+    """
+    Turn-based interview: start with the questions, submit answers one at a
+    time and finish for the report. Each answer is scored in the background
+    as soon as it arrives, so finish() only waits for the last score and
+    makes one short aggregation call, however many questions there were.
+    """
+    def __init__(self, agent, candidate_info, difficulty, questions):
+        self.id = uuid.uuid4().hex
+        self.agent = agent
+        self.candidate_info = candidate_info
+        self.difficulty = difficulty
+        self.questions = questions
+        self.history = []
+        self._scores = []
+        self.report = None
+        self.updated_at = time.time()
+        # Concurrent requests for one session must not answer the same question twice
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return len(self.history) >= len(self.questions)
+
+    def current_question(self):
+        """The question awaiting an answer, or None once all are answered"""
+        return None if self.done else self.questions[len(self.history)]
+
+    def submit_answer(self, answer):
+        """Record an answer, start scoring it and return the next question (None when done)"""
+        with self._lock:
+            question = self.current_question()
+            if question is None:
+                raise ValueError("All questions have already been answered")
+            entry = {
+                "question": question['text'],
+                "response": answer.strip(),
+                "expected_skills": question.get('skills', [])
+            }
+            self.history.append(entry)
+            self.agent.responses.append({"question": entry["question"], "answer": entry["response"]})
+            self._scores.append(_get_scoring_executor().submit(self._score_answer, entry))
+            self.updated_at = time.time()
+            return self.current_question()
+
+    def _score_answer(self, entry):
+        prompt = f"""
+        Evaluate this answer from a {self.difficulty} level {self.candidate_info['job_profile']} interview.
+
+        Question: {entry['question']}
+        Skills tested: {', '.join(entry['expected_skills'])}
+        Answer: {entry['response'] or '(no answer)'}
+
+        Score it from 1 (poor) to 10 (excellent) and note strengths and improvements in one sentence each.
+        Return ONLY a valid JSON object: {{"score": 7, "strengths": "...", "improvements": "...", "skills_demonstrated": ["..."]}}
+        """
+        return self.agent.ai_model.generate_json(prompt, ANSWER_EVALUATION_SCHEMA, max_tokens=256, expect=dict)
+
+    def evaluations(self):
+        """Per-answer evaluations, waiting for any still being scored (None where scoring failed)"""
+        results = []
+        for future in self._scores:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Error scoring answer: {e}")
+                results.append(None)
+        return results
+
+    def finish(self):
+        """Aggregate the per-answer evaluations into the interview report"""
+        with self._lock:
+            return self._finish()
+
+    def _finish(self):
+        if self.report is not None:
+            return self.report
+        evaluations = self.evaluations()
+        for entry, evaluation in zip(self.history, evaluations):
+            entry["evaluation"] = evaluation
+
+        lines = []
+        for i, (entry, evaluation) in enumerate(zip(self.history, evaluations), 1):
+            if evaluation:
+                lines.append(
+                    f"Q{i} ({evaluation.get('score', '?')}/10): strengths: {evaluation.get('strengths', '')}; "
+                    f"improvements: {evaluation.get('improvements', '')}"
+                )
+            else:
+                lines.append(f"Q{i}: not scored. Answer: {entry['response'][:300]}")
+
+        info = self.candidate_info
+        prompt = f"""
+        Summarise this {self.difficulty} level interview for a {info['job_profile']} position.
+
+        Candidate Profile:
+        - Skills: {', '.join(info['skills'])}
+        - Experience: {info['experience']} years
+
+        Per-question evaluations:
+        {chr(10).join(lines)}
+
+        Provide analysis covering:
+        -Technical knowledge depth
+        -Problem-solving approach
+        -Communication clarity
+        -Skill validation
+        -Improvement suggestions
+        -Overall suitability
+
+        Format in clear sections with bullet points. Keep it under 250 words.
+        """
+        ai_analysis = self.agent.ai_model.generate_response(prompt, max_tokens=600)
+        if not ai_analysis:
+            ai_analysis = "Could not generate analysis due to technical error"
+
+        scores = [e["score"] if e and isinstance(e.get("score"), (int, float)) else None for e in evaluations]
+        scored = [score for score in scores if score is not None]
+        if scored:
+            per_question = ", ".join(
+                f"Q{i}: {score}/10" if score is not None else f"Q{i}: n/a" for i, score in enumerate(scores, 1)
+            )
+            ai_analysis += f"\n\nPer-question scores: {per_question}\nAverage score: {sum(scored) / len(scored):.1f}/10"
+
+        self.report = self.agent.report_generator.generate_interview_report(
+            info, self.difficulty, self.history, ai_analysis
+        )
+        self.updated_at = time.time()
+        return self.report
+
+class InterviewSessionStore:
+    """
+    In-process registry of live sessions for the HTTP API. Sessions idle for
+    longer than ttl seconds are dropped; with several server processes the
+    session's requests must reach the same process (sticky sessions).
+    """
+    def __init__(self, ttl=None):
+        self.ttl = ttl or float(os.getenv("INTERVIEW_SESSION_TTL", 3600))
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def add(self, session):
+        with self._lock:
+            now = time.time()
+            for session_id in [sid for sid, s in self._sessions.items() if now - s.updated_at > self.ttl]:
+                del self._sessions[session_id]
+            self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def pop(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None)
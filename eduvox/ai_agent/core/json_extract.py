@@ -0,0 +1,112 @@
+import re
+import json
+
+_TRAILING_COMMA = re.compile(r',\s*([\]}])')
+_CLOSERS = {'{': '}', '[': ']'}
+
+class JSONStreamParser:
+    """
+    Incremental, tolerant extractor for JSON embedded in model output.
+    Text is fed in chunks (e.g. from a stream) and scanned once; prose, code
+    fences and anything outside the first top-level object/array are ignored.
+    partial() recovers the complete elements of a value that was cut off,
+    such as a response truncated by the output token limit.
+    """
+    def __init__(self, expect=None):
+        # expect: dict or list to only accept that kind of top-level value
+        self._openers = {dict: '{', list: '['}.get(expect, '{[')
+        self._text = ""
+        self._pos = 0
+        self._start = None
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._cut = None  # (position, open brackets) after the last complete element
+        self.values = []
+
+    def feed(self, chunk):
+        """Add text; returns top-level values completed by this chunk"""
+        self._text += chunk
+        completed = []
+        text = self._text
+        while self._pos < len(text):
+            c = text[self._pos]
+            self._pos += 1
+            if self._start is None:
+                if c in self._openers:
+                    self._start = self._pos - 1
+                    self._stack = [c]
+                    self._cut = None
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                continue
+            if c == '"':
+                self._in_string = True
+            elif c in _CLOSERS:
+                self._stack.append(c)
+            elif c in ']}':
+                self._stack.pop()
+                if not self._stack:
+                    value = self._load(text[self._start:self._pos])
+                    if value is None:
+                        # Not valid JSON after all; rescan from just past its opener
+                        self._pos = self._start + 1
+                    else:
+                        completed.append(value)
+                        self.values.append(value)
+                    self._start = None
+                elif len(self._stack) == 1:
+                    self._cut = (self._pos, tuple(self._stack))
+            elif c == ',' and len(self._stack) == 1:
+                self._cut = (self._pos - 1, tuple(self._stack))
+        return completed
+
+    def partial(self):
+        """
+        Best-effort value for an unfinished top-level object/array: the
+        complete elements seen so far, closed off. None if nothing usable.
+        """
+        if self._start is None:
+            return None
+        # Closing everything where the text stops is only safe outside a
+        # string; a string cut off mid-way must not pass as complete
+        if not self._in_string:
+            value = self._load(self._text[self._start:] + "".join(_CLOSERS[c] for c in reversed(self._stack)))
+            if value is not None:
+                return value
+        # Otherwise drop the unfinished element and close the container
+        if self._cut is not None:
+            position, stack = self._cut
+            return self._load(self._text[self._start:position] + "".join(_CLOSERS[c] for c in reversed(stack)))
+        return self._load(self._stack[0] + _CLOSERS[self._stack[0]])
+
+    @staticmethod
+    def _load(text):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        try:
+            # Models often leave a trailing comma before a closing bracket
+            return json.loads(_TRAILING_COMMA.sub(r'\1', text))
+        except json.JSONDecodeError:
+            return None
+
+def extract_json(text, expect=None, allow_partial=True):
+    """
+    First JSON object/array in text (optionally only dict or list), or None.
+    With allow_partial, a truncated value yields its complete elements.
+    """
+    if not text:
+        return None
+    parser = JSONStreamParser(expect)
+    completed = parser.feed(text)
+    if completed:
+        return completed[0]
+    return parser.partial() if allow_partial else None
@@ -0,0 +1,178 @@
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+from utils.app_data import app_data_path, create_private_file
+
+_TOKEN = re.compile(r'[a-z0-9+#]+')
+_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'for', 'in', 'to', 'with', 'on', 'at', 'or'}
+# Role words shared by unrelated profiles ("Mechanical Engineer" vs "Software Engineer")
+GENERIC_ROLE_WORDS = {
+    'engineer', 'engineering', 'developer', 'development', 'manager', 'management', 'specialist',
+    'analyst', 'consultant', 'associate', 'executive', 'officer', 'assistant', 'lead', 'head',
+    'senior', 'junior', 'sr', 'jr', 'intern', 'trainee', 'staff', 'principal'
+}
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords ("C++" and "C#" survive)"""
+    return {t for t in _TOKEN.findall(str(text).lower()) if t not in _STOPWORDS}
+
+class QuestionBank:
+    """
+    Persistent store of interview questions from past generations, indexed by
+    job profile, difficulty and skill tags. Questions live in SQLite; an
+    in-memory inverted index (token -> question ids) answers lookups without
+    touching the database. A stored question is only eligible when its job
+    profile is the same, or covers at least min_profile_match of the
+    IDF-weighted distinctive words of the requested profile (generic role
+    words don't count). Eligible questions are ranked by that overlap
+    (weighted double) and the candidate's skills, and questions used less
+    often come first so repeat candidates see some variety.
+    """
+    def __init__(self, db_path=None, min_profile_match=None):
+        self.db_path = db_path or os.getenv('QUESTION_BANK_DB') or app_data_path('question_bank.db')
+        self.min_profile_match = min_profile_match or float(os.getenv('QUESTION_BANK_MIN_MATCH', 0.75))
+        self.stats = {"lookups": 0, "served": 0, "added": 0}
+        self._lock = threading.Lock()
+        self._questions = {}
+        self._profile_index = defaultdict(set)
+        self._by_profile = defaultdict(set)
+        self._skill_index = defaultdict(set)
+        self._max_id = 0
+
+        create_private_file(self.db_path)
+        self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY, text TEXT NOT NULL, job_profile TEXT NOT NULL, "
+            "difficulty TEXT NOT NULL, skills TEXT NOT NULL, source TEXT NOT NULL, "
+            "uses INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+            "UNIQUE (text, job_profile, difficulty))"
+        )
+        self._db.commit()
+        self._refresh()
+
+    def _refresh(self):
+        """Index rows added since the last refresh, including other workers' additions"""
+        for row in self._db.execute(
+            "SELECT id, text, job_profile, difficulty, skills, source, uses FROM questions WHERE id > ?",
+            (self._max_id,)
+        ):
+            self._index(*row)
+
+    def _index(self, question_id, text, job_profile, difficulty, skills, source, uses):
+        entry = {
+            "text": text, "job_profile": job_profile, "difficulty": difficulty,
+            "skills": json.loads(skills), "source": source, "uses": uses
+        }
+        self._questions[question_id] = entry
+        self._max_id = max(self._max_id, question_id)
+        self._by_profile[job_profile].add(question_id)
+        for token in tokenize(job_profile):
+            self._profile_index[token].add(question_id)
+        for token in tokenize(" ".join(entry["skills"])):
+            self._skill_index[token].add(question_id)
+
+    def add(self, questions, job_profile, source="generated"):
+        """Store questions ({"text", "difficulty", "skills"}); duplicates are ignored"""
+        profile = job_profile.strip().lower()
+        with self._lock:
+            for q in questions:
+                text = q.get('text', '').strip()
+                if not text:
+                    continue
+                skills = json.dumps(q.get('skills', []))
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO questions (text, job_profile, difficulty, skills, source, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (text, profile, q['difficulty'], skills, source, time.time())
+                )
+                if cursor.rowcount:
+                    self._index(cursor.lastrowid, text, profile, q['difficulty'], skills, source, 0)
+                    self.stats["added"] += 1
+            self._db.commit()
+
+    def _idf(self, index, token):
+        return math.log(1 + len(self._questions) / (1 + len(index.get(token, ()))))
+
+    def find(self, job_profile, difficulty, skills=(), limit=5, exclude=(), sources=("generated",)):
+        """
+        Up to `limit` stored questions for this profile and difficulty, best
+        match first. Returns [] when no stored profile matches closely enough.
+        """
+        profile = job_profile.strip().lower()
+        profile_tokens = tokenize(job_profile) - GENERIC_ROLE_WORDS
+        skill_tokens = tokenize(" ".join(skills))
+        excluded = {text.strip().lower() for text in exclude}
+        with self._lock:
+            self.stats["lookups"] += 1
+            self._refresh()
+            weights = {token: self._idf(self._profile_index, token) for token in profile_tokens}
+            total = sum(weights.values())
+            matched = defaultdict(float)
+            for token, weight in weights.items():
+                for question_id in self._profile_index.get(token, ()):
+                    matched[question_id] += weight
+
+            scores = {question_id: 2 * total for question_id in self._by_profile.get(profile, ())}
+            for question_id, weight in matched.items():
+                if weight / total >= self.min_profile_match:
+                    scores[question_id] = max(scores.get(question_id, 0.0), 2 * weight)
+            for token in skill_tokens:
+                weight = self._idf(self._skill_index, token)
+                for question_id in self._skill_index.get(token, ()):
+                    if question_id in scores:
+                        scores[question_id] += weight
+
+            candidates = [
+                question_id for question_id in scores
+                if self._questions[question_id]["difficulty"] == difficulty
+                and self._questions[question_id]["source"] in sources
+                and self._questions[question_id]["text"].lower() not in excluded
+            ]
+            candidates.sort(key=lambda qid: (-scores[qid], self._questions[qid]["uses"]))
+            chosen = candidates[:limit]
+
+            for question_id in chosen:
+                self._questions[question_id]["uses"] += 1
+            if chosen:
+                self._db.executemany(
+                    "UPDATE questions SET uses = uses + 1 WHERE id = ?", [(qid,) for qid in chosen]
+                )
+                self._db.commit()
+            self.stats["served"] += len(chosen)
+            return [
+                {
+                    "text": self._questions[qid]["text"],
+                    "difficulty": difficulty,
+                    "skills": list(self._questions[qid]["skills"])
+                }
+                for qid in chosen
+            ]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._questions)
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+_question_bank = None
+_question_bank_lock = threading.Lock()
+
+def get_question_bank():
+    """Process-wide question bank"""
+    global _question_bank
+    with _question_bank_lock:
+        if _question_bank is None:
+            _question_bank = QuestionBank()
+        return _question_bank
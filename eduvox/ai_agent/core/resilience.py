@@ -0,0 +1,219 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit breaker is open"""
+    pass
+
+def is_transient(error):
+    """
+    Whether an upstream error is worth retrying and counts against the breaker:
+    timeouts, connection errors, 429 and 5xx. Errors such as a safety-blocked
+    reply or a 400 would fail the same way again.
+    """
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # google.api_core exceptions carry the HTTP status as `code`
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and (code == 429 or 500 <= code < 600)
+
+class RetryBudget:
+    """
+    Global retry budget: every call deposits `ratio` tokens and every retry
+    or hedge withdraws one, so retries can never exceed ~ratio of traffic.
+    """
+    def __init__(self, ratio=0.2, min_tokens=3, max_tokens=20):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+class CircuitBreaker:
+    """Opens after consecutive failed calls, then lets a single probe through after reset_timeout"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+    def __init__(self, window=200, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct):
+        """Latency at the given percentile, or None until enough samples exist"""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class ResiliencePolicy:
+    """
+    One overall deadline per call, exponential-backoff retries of transient
+    errors under a retry budget, optional hedged requests after the p95
+    latency and a circuit breaker that only counts transient failures.
+    """
+    def __init__(self, max_retries=2, base_delay=0.5, max_delay=8.0, hedge=False,
+                 retry_budget=None, breaker=None, latency=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.retry_budget = retry_budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = latency or LatencyTracker()
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "failures": 0, "rejected": 0}
+
+    async def call(self, attempt, timeout):
+        """
+        Run attempt(remaining) (a coroutine factory given the seconds left
+        before the deadline) with retries, hedging and the breaker. Raises
+        CircuitOpenError when failing fast, or the last attempt's error.
+        """
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise CircuitOpenError("Circuit breaker open; skipping upstream call")
+
+        self.stats["calls"] += 1
+        self.retry_budget.deposit()
+        deadline = time.monotonic() + timeout
+        last_error = None
+        for n in range(self.max_retries + 1):
+            if n > 0:
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (n - 1)))  # full jitter
+                if time.monotonic() + delay >= deadline or not self.retry_budget.withdraw():
+                    break
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+            try:
+                result = await self._attempt(attempt, deadline - time.monotonic())
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                if not is_transient(e):
+                    # Upstream answered; the request itself is at fault
+                    self.breaker.record_success()
+                    raise
+                last_error = e
+
+        self.stats["failures"] += 1
+        self.breaker.record_failure()
+        raise last_error
+
+    async def _attempt(self, attempt, timeout):
+        """One attempt under the remaining deadline, hedged once the p95 delay passes"""
+        start = time.monotonic()
+        hedge_delay = self.latency.percentile(95) if self.hedge else None
+
+        if hedge_delay is None or hedge_delay >= timeout:
+            result = await asyncio.wait_for(attempt(timeout), timeout)
+        else:
+            result = await self._hedged(attempt, timeout, hedge_delay, start)
+
+        self.latency.record(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, attempt, timeout, hedge_delay, start):
+        primary = asyncio.ensure_future(attempt(timeout))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+        if not self.retry_budget.withdraw():
+            return await asyncio.wait_for(primary, timeout - hedge_delay)
+
+        self.stats["hedges"] += 1
+        pending = {primary, asyncio.ensure_future(attempt(timeout - hedge_delay))}
+        tasks = set(pending)
+        last_error = None
+        try:
+            while pending:
+                remaining = timeout - (time.monotonic() - start)
+                done, pending = await asyncio.wait(pending, timeout=max(0, remaining),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            # First result wins; drop the other request
+            for task in tasks:
+                task.cancel()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["breaker_state"] = self.breaker.state
+        stats["p95_latency"] = self.latency.percentile(95)
+        return stats
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+def get_policy(name="gemini"):
+    """Process-wide policy per upstream, so every caller shares one breaker and budget"""
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = ResiliencePolicy(
+                max_retries=int(os.getenv("GEMINI_MAX_RETRIES", 2)),
+                hedge=os.getenv("GEMINI_HEDGE", "0") == "1"
+            )
+        return _policies[name]
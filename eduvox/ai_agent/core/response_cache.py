@@ -0,0 +1,186 @@
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from utils.app_data import create_private_file
+
+class ResponseCache:
+    """
+    Two-tier prompt/response cache: in-memory LRU in front of SQLite.
+    get_async()/set_nowait() keep the disk tier off event loops: lookups
+    that miss memory and all writes run on the cache's own I/O thread.
+    """
+    def __init__(self, db_path=None, max_memory_entries=512, max_disk_entries=10000, ttl=24 * 3600,
+                 evict_every=100):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl  # seconds, None disables expiry
+        self.evict_every = evict_every  # disk writes between size checks
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()  # memory tier and stats
+        self._db_lock = threading.Lock()  # disk tier, so slow I/O never holds up memory lookups
+        self._writes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        # On-disk tier is optional; without a path the cache is memory-only
+        self._db = None
+        self._io = None
+        if db_path:
+            create_private_file(db_path)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)")
+            self._db.commit()
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache")
+
+    @staticmethod
+    def make_key(model_name, prompt, generation_config):
+        """Stable key from model name, prompt and generation config"""
+        payload = json.dumps([model_name, prompt, generation_config], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key):
+        """Return the cached value or None"""
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            value = self._get_disk(key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def get_async(self, key):
+        """get() for event loops: the disk lookup runs on the cache's I/O thread"""
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            value = await asyncio.wrap_future(self._io.submit(self._get_disk, key))
+        if value is None:
+            self._count_miss()
+        return value
+
+    def _count_miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def _get_memory(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if self._expired(created_at, now):
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return value
+
+    def _get_disk(self, key):
+        now = time.time()
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._expired(created_at, now):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        with self._lock:
+            self._remember(key, value, created_at)
+            self.stats["disk_hits"] += 1
+        return value
+
+    def set(self, key, value):
+        """Store a value in both tiers"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        if self._db is not None:
+            self._set_disk(key, value, now)
+
+    def set_nowait(self, key, value):
+        """set() without blocking: the disk write is queued on the cache's I/O thread"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        if self._db is not None:
+            self._io.submit(self._set_disk, key, value, now)
+
+    def _set_disk(self, key, value, now):
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict_disk()
+            self._db.commit()
+
+    def _remember(self, key, value, created_at):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self):
+        """Trim the disk tier to max_disk_entries, least recently used first"""
+        count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            with self._lock:
+                self.stats["evictions"] += overflow
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def get_stats(self):
+        """Hit/miss counters plus the current hit rate"""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Finish queued disk writes and close the database"""
+        if self._io is not None:
+            self._io.shutdown(wait=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from utils.app_data import app_data_path, create_private_file
+
+# Bump when text extraction or resume parsing changes so old entries stop matching
+EXTRACTION_VERSION = 4
+
+class ResumeCache:
+    """
+    Persistent cache of resume processing results keyed by the file's content.
+    Stores the extracted text and the parsed skills/experience/achievements, so
+    re-uploading the same resume skips OCR and the analysis call. The total
+    size on disk is bounded; least recently used entries are evicted first.
+    """
+    def __init__(self, db_path=None, max_bytes=None):
+        self.db_path = db_path or os.getenv('RESUME_CACHE_DB') or app_data_path('resume_cache.db')
+        self.max_bytes = max_bytes or int(float(os.getenv('RESUME_CACHE_MAX_MB', 64)) * 1024 * 1024)
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        create_private_file(self.db_path)
+        self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, analysis TEXT, method TEXT, "
+            "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_resumes_accessed ON resumes (accessed_at)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(file_path, model_name):
+        """Hash of the file bytes, the analysing model and the extraction version"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"|{model_name}|{EXTRACTION_VERSION}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return {"text", "analysis", "method"} or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, analysis, method FROM resumes WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._db.execute("UPDATE resumes SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.stats["hits"] += 1
+        text, analysis, method = row
+        return {"text": text, "analysis": json.loads(analysis) if analysis else None, "method": method}
+
+    def set(self, key, text, analysis=None, method=None):
+        """Store extracted text and, when available, the parsed analysis"""
+        analysis = json.dumps(analysis) if analysis else None
+        size = len(text.encode("utf-8")) + len(analysis or "")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO resumes (key, text, analysis, method, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, analysis, method, size, time.time())
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the total size fits max_bytes"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM resumes ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM resumes WHERE key = ?", (key,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+def get_resume_cache():
+    """Process-wide resume cache"""
+    global _resume_cache
+    with _resume_cache_lock:
+        if _resume_cache is None:
+            _resume_cache = ResumeCache()
+        return _resume_cache
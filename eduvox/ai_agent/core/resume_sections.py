@@ -0,0 +1,192 @@
+import re
+import time
+
+# Section name -> header spellings, including common OCR misreadings.
+# Sections beyond skills/achievements/experience are mostly there so they
+# end the section before them instead of being swallowed into it.
+SECTION_HEADERS = {
+    'skills': ['Skills', 'Technical Skills', 'Areas of Expertise', 'Core Competencies',
+               'Proficiencies', 'Abilities', 'skits', 'skis'],
+    'achievements': ['Achievements', 'Accomplishments', 'Awards', 'Honors'],
+    'experience': ['Experience', 'Work Experience', 'Professional Experience',
+                   'Employment History', 'Work History'],
+    'education': ['Education', 'Academic Background', 'Qualifications'],
+    'projects': ['Projects', 'Personal Projects', 'Academic Projects'],
+    'certifications': ['Certifications', 'Certificates', 'Licenses'],
+    'summary': ['Summary', 'Professional Summary', 'Objective', 'Career Objective', 'About Me'],
+    'contact': ['Contact', 'Contact Information'],
+    'languages': ['Languages'],
+    'interests': ['Interests', 'Hobbies'],
+    'references': ['References']
+}
+
+# Words that may precede a header name ("Key Skills", "Relevant Experience")
+HEADER_QUALIFIERS = ['Key', 'Relevant', 'Core', 'Additional', 'Other', 'Selected', 'Notable',
+                     'Technical', 'Professional', 'Soft', 'Hard', 'Related', 'Previous', 'Prior',
+                     'Industry', 'Major', 'Academic', 'Personal', 'Research', 'Volunteer']
+
+# Words that start prose rather than a list ("Experience with Kubernetes, Docker")
+_PROSE_WORDS = {'a', 'an', 'the', 'with', 'in', 'of', 'at', 'on', 'for', 'to', 'from', 'by', 'as',
+                'and', 'or', 'is', 'are', 'was', 'were', 'using', 'including', 'that', 'which'}
+
+_PAGE_MARKER = re.compile(r'^--- Page \d+ ---$', re.MULTILINE)
+
+class SectionSegmenter:
+    """
+    Splits resume text into sections in a single pass: every header is found
+    with one precompiled pattern, and each section is the text between its
+    header and the next one. A header starts a line, may carry qualifiers
+    ("Key Skills") and is followed by a colon, dash, the end of the line, or
+    same-line content as OCR paragraphs produce ("Skills Python, Java").
+    Same-line content is accepted after a header in capitals, after a
+    capitalised header when it doesn't start lowercase, or when it is a list
+    ("Skills python, java"), so prose such as "Experience with Kubernetes"
+    is not a header.
+    """
+    def __init__(self, headers=None, qualifiers=None):
+        self.headers = {section: list(names) for section, names in (headers or SECTION_HEADERS).items()}
+        self.qualifiers = list(qualifiers or HEADER_QUALIFIERS)
+        self._compile()
+
+    def _compile(self):
+        self._section_of = {}
+        for section, names in self.headers.items():
+            for name in names:
+                self._section_of[name.lower()] = section
+        # Longest first so "Work Experience" wins over "Experience"
+        alternatives = sorted(self._section_of, key=len, reverse=True)
+        qualifiers = '|'.join(re.escape(q) for q in self.qualifiers)
+        self._pattern = re.compile(
+            r'^[ \t•*\-]*((?:(?:' + qualifiers + r')[ \t]+)*(' + '|'.join(re.escape(a) for a in alternatives) + r'))'
+            r'(?:[ \t]*(?::|[|–—]|-(?=[ \t]))|[ \t]*$|[ \t]+(?=(\S[^\n]*)))',
+            re.IGNORECASE | re.MULTILINE
+        )
+
+    @staticmethod
+    def _is_list(content):
+        """Whether same-line content reads as a list ("python, java") rather than prose"""
+        first_word = content.split(None, 1)[0].lower()
+        return first_word not in _PROSE_WORDS and re.search(r'[,;|•]', content) is not None
+
+    def add_headers(self, section, *names):
+        """Extend the vocabulary, e.g. add_headers('skills', 'Tech Stack')"""
+        self.headers.setdefault(section, []).extend(names)
+        self._compile()
+
+    def find_headers(self, text):
+        """(section, header_start, content_start) for every header, in order"""
+        found = []
+        for match in self._pattern.finditer(text):
+            header, name, content = match.groups()
+            # Header followed by content on the same line without a separator
+            if content and not (header.isupper() or self._is_list(content)
+                                or (not header.islower() and not content[0].islower())):
+                continue
+            found.append((self._section_of[name.lower()], match.start(), match.end()))
+        return found
+
+    def segment(self, text):
+        """Section name -> combined content of every instance of that section"""
+        headers = self.find_headers(text)
+        parts = {}
+        for i, (section, _, content_start) in enumerate(headers):
+            content_end = headers[i + 1][1] if i + 1 < len(headers) else len(text)
+            content = _PAGE_MARKER.sub('', text[content_start:content_end]).strip()
+            if content:
+                parts.setdefault(section, []).append(content)
+        return {section: "\n".join(contents) for section, contents in parts.items()}
+
+_default_segmenter = SectionSegmenter()
+
+def get_segmenter():
+    """Shared segmenter; add headers to it to extend extract_sections"""
+    return _default_segmenter
+
+def segment_sections(text):
+    return _default_segmenter.segment(text)
+
+# ----------------- Benchmark -----------------
+
+def _legacy_extract_sections(text):
+    """The previous regex-per-section implementation, kept for comparison"""
+    sections = {}
+    patterns = {
+        'skills': r'(?:Skills|Technical Skills|Areas of Expertise|Core Competencies|Proficiencies|Abilities|skits|skis)[:\n]*(.*?)(?=\n[A-Z]|\Z)',
+        'achievements': r'(?:Achievements|Accomplishments|Awards|Honors)[:\n]*(.*?)(?=\n[A-Z]|\Z)',
+        'experience': r'(?:Experience|Work Experience|Professional Experience|Employment History|Work History)[:\n]*(.*?)(?=\n[A-Z]|\Z)'
+    }
+    for section, pattern in patterns.items():
+        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        if matches:
+            sections[section] = "\n".join(match.strip() for match in matches if match.strip())
+    return sections
+
+# Header shapes the legacy extractor handled; the segmenter must find the
+# same sections in each
+_HEADER_SHAPES = [
+    "Key Skills: Python, SQL",
+    "Relevant Experience\nAcme 2020-2023",
+    "Skills python, java",
+    "skills: a, b\nachievements - won x",
+    "Skills Python, Java, SQL\nExperience 3 years at Acme",
+    "ACHIEVEMENTS speaker at PyCon",
+]
+
+def _sample_resume(pages):
+    # Rotating pages: headers on their own line, EasyOCR paragraph output
+    # where content follows the header on the same line, and the header
+    # shapes above
+    text_page = (
+        "JOHN DOE\njohn.doe@example.com | +1 555 0100\n"
+        "Summary\nBackend engineer focused on distributed systems and developer tooling.\n"
+        "Technical Skills:\nPython, Go, SQL, Docker, Kubernetes, AWS, Terraform\n"
+        "Work Experience\n"
+        + "".join(f"- Led project {i}, cutting latency by {i * 3}% across the services we owned\n" for i in range(15))
+        + "Achievements\n- Speaker at PyCon\n- Patent on stream processing\n"
+        "Education\nB.Sc. Computer Science, 2016\n"
+    )
+    ocr_page = (
+        "JOHN DOE john.doe@example.com +1 555 0100\n"
+        "Summary Backend engineer with experience in distributed systems\n"
+        "Skills Python, Java, SQL, Docker\n"
+        "Experience 3 years at Acme building payment services, "
+        + " ".join(f"led project {i} cutting latency by {i * 3}%." for i in range(15)) + "\n"
+        "ACHIEVEMENTS speaker at PyCon, patent on stream processing\n"
+        "Education B.Sc. Computer Science 2016\n"
+    )
+    shapes_page = "\n".join(_HEADER_SHAPES) + "\n"
+    page_kinds = (text_page, ocr_page, shapes_page)
+    return "".join(
+        f"\n--- Page {n} ---\n{page_kinds[(n - 1) % len(page_kinds)]}" for n in range(1, pages + 1)
+    )
+
+def _missing_sections(text):
+    """Sections the legacy extractor finds in text that the segmenter doesn't"""
+    return sorted(set(_legacy_extract_sections(text)) - set(segment_sections(text)))
+
+def benchmark(pages=(1, 10, 50, 200), repeat=5):
+    """
+    Check the segmenter finds every section the legacy extractor did, then
+    time the two on growing multi-page texts
+    """
+    for shape in _HEADER_SHAPES:
+        missing = _missing_sections(shape)
+        if missing:
+            print(f"Segmenter misses {missing} in {shape!r}")
+    print(f"{'pages':>6} {'chars':>9} {'legacy ms':>10} {'segmenter ms':>13} {'speedup':>8}")
+    for n in pages:
+        text = _sample_resume(n)
+        missing = _missing_sections(text)
+        if missing:
+            print(f"Segmenter misses {missing} in the {n}-page sample")
+        timings = []
+        for fn in (_legacy_extract_sections, segment_sections):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn(text)
+            timings.append((time.perf_counter() - start) / repeat * 1000)
+        legacy, segmenter = timings
+        print(f"{n:>6} {len(text):>9} {legacy:>10.2f} {segmenter:>13.2f} {legacy / segmenter:>7.1f}x")
+
+if __name__ == "__main__":
+    benchmark()
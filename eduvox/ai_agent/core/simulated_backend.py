@@ -0,0 +1,197 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+
+class SimulatedBackendError(Exception):
+    """
+    Raised when the simulated backend injects an upstream failure. Carries an
+    HTTP status as `code`, like google.api_core errors, so retries and the
+    circuit breaker treat it as they would a real 429 or 503.
+    """
+    def __init__(self, message, code=503):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+class SimulatedResponse:
+    """Mimics the parts of a Gemini response the app reads"""
+    def __init__(self, text):
+        self.text = text
+
+class LatencyModel:
+    """
+    Latency distribution in seconds, parsed from a spec string:
+    - "fixed:0.8"
+    - "normal:1.2,0.3"  (mean, standard deviation)
+    - "histogram:0.4,0.6,1.8" or "histogram:latencies.json"  (recorded samples)
+    """
+    def __init__(self, spec="fixed:0", rng=None):
+        self.rng = rng or random.Random()
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip().lower()
+
+        if self.kind == "fixed":
+            self.value = float(args or 0)
+        elif self.kind == "normal":
+            mean, _, std = args.partition(",")
+            self.mean = float(mean)
+            self.std = float(std or 0)
+        elif self.kind == "histogram":
+            if os.path.exists(args):
+                with open(args) as f:
+                    self.samples = [float(x) for x in json.load(f)]
+            else:
+                self.samples = [float(x) for x in args.split(",") if x.strip()]
+            if not self.samples:
+                raise ValueError("Histogram latency model needs at least one sample")
+        else:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+    def sample(self):
+        if self.kind == "fixed":
+            return self.value
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(self.mean, self.std))
+        return self.rng.choice(self.samples)
+
+class SimulatedModel:
+    """
+    Drop-in stand-in for genai.GenerativeModel used for offline load tests.
+    Responses are deterministic for a given prompt; latency and failures
+    follow the configured distribution and error rate.
+    """
+    RESPONSES = {
+        "opening": "This is a simulated opening statement on '{topic}'. I would like to present three key arguments. First, evidence suggests this position has merit. Second, multiple studies confirm these findings. Third, we should consider the broader implications.",
+        "argument": "Here's my counterpoint on '{topic}': While that position has some validity, recent evidence suggests otherwise. Consider the following facts that challenge this assumption.",
+        "question": "How do you reconcile your position on '{topic}' with the recent findings that suggest an alternative interpretation of the data?",
+        "default": "I acknowledge your points on '{topic}' and would like to respond with a thoughtful consideration of the evidence presented."
+    }
+
+    def __init__(self, model_name="simulated", latency="fixed:0", error_rate=0.0, chunk_delay=0.02, seed=None,
+                 error_codes=(503,)):
+        self.model_name = model_name
+        self.rng = random.Random(seed)
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel(latency, self.rng)
+        self.error_rate = error_rate
+        # Status of injected failures, picked uniformly (e.g. (429, 503) for a mix)
+        self.error_codes = tuple(error_codes)
+        self.chunk_delay = chunk_delay
+        self.stats = {"calls": 0, "errors": 0}
+
+    @classmethod
+    def from_env(cls, model_name="simulated"):
+        """Build from AI_SIM_LATENCY, AI_SIM_ERROR_RATE, AI_SIM_ERROR_CODES (e.g. "429,503") and AI_SIM_SEED"""
+        seed = os.getenv("AI_SIM_SEED")
+        return cls(
+            model_name=model_name,
+            latency=os.getenv("AI_SIM_LATENCY", "fixed:0"),
+            error_rate=float(os.getenv("AI_SIM_ERROR_RATE", 0)),
+            seed=int(seed) if seed else None,
+            error_codes=[int(c) for c in os.getenv("AI_SIM_ERROR_CODES", "503").split(",") if c.strip()]
+        )
+
+    # ----------------- Response selection -----------------
+
+    def render(self, prompt, generation_config=None):
+        """Deterministic canned or templated text for a prompt"""
+        prompt = str(prompt)
+        lowered = prompt.lower()
+
+        if "resume" in lowered and "json" in lowered:
+            text = json.dumps({
+                "skills": ["Communication", "Problem Solving", "Python"],
+                "experience": "2 years",
+                "achievements": ["Completed a simulated project"]
+            })
+        elif "interview questions" in lowered and "json" in lowered:
+            count = re.search(r"exactly (\d+)", lowered)
+            count = int(count.group(1)) if count else 5
+            digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:6]
+            text = json.dumps([
+                {"text": f"Simulated question {i + 1} ({digest})?", "difficulty": "Entry", "skills": ["general"]}
+                for i in range(count)
+            ])
+        elif "evaluate this answer" in lowered:
+            score = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16) % 6 + 4
+            text = json.dumps({
+                "score": score,
+                "strengths": "Relevant and clearly structured answer.",
+                "improvements": "Add a concrete example with measurable results.",
+                "skills_demonstrated": ["communication"]
+            })
+        elif "json array of strings" in lowered:
+            count = re.search(r"exactly (\d+)", lowered)
+            count = int(count.group(1)) if count else 1
+            topic = re.search(r"'([^']+)'", prompt)
+            topic = topic.group(1) if topic else "this topic"
+            text = json.dumps([
+                f"Question {i + 1}: how does your position on '{topic}' hold up against the strongest counter-example?"
+                for i in range(count)
+            ])
+        else:
+            topic = re.search(r"'([^']+)'", prompt)
+            topic = topic.group(1) if topic else "this topic"
+            # Pick the template from the turn instruction (last paragraph),
+            # not from debate context that may precede it
+            instruction = lowered.strip().split("\n\n")[-1]
+            for keyword in ("opening", "argument", "question"):
+                if keyword in instruction:
+                    break
+            else:
+                keyword = "default"
+            text = self.RESPONSES[keyword].format(topic=topic)
+
+        # Respect the output budget roughly (about 0.75 words per token)
+        max_tokens = (generation_config or {}).get("max_output_tokens")
+        if max_tokens:
+            words = text.split(" ")
+            text = " ".join(words[:max(1, int(max_tokens * 0.75))])
+        return text
+
+    def _before_call(self):
+        """Sample latency and the status code this call fails with (None when it succeeds)"""
+        self.stats["calls"] += 1
+        delay = self.latency.sample()
+        failed = None
+        if self.rng.random() < self.error_rate:
+            failed = self.rng.choice(self.error_codes)
+            self.stats["errors"] += 1
+        return delay, failed
+
+    def _chunks(self, text):
+        return [word + " " for word in text.split(" ")]
+
+    # ----------------- GenerativeModel interface -----------------
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        delay, failed = self._before_call()
+        time.sleep(delay)
+        if failed:
+            raise SimulatedBackendError("Simulated upstream error", code=failed)
+        text = self.render(prompt, generation_config)
+        if not stream:
+            return SimulatedResponse(text)
+
+        def chunks():
+            for chunk in self._chunks(text):
+                yield SimulatedResponse(chunk)
+                time.sleep(self.chunk_delay)
+        return chunks()
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False, **kwargs):
+        delay, failed = self._before_call()
+        await asyncio.sleep(delay)
+        if failed:
+            raise SimulatedBackendError("Simulated upstream error", code=failed)
+        text = self.render(prompt, generation_config)
+        if not stream:
+            return SimulatedResponse(text)
+
+        async def chunks():
+            for chunk in self._chunks(text):
+                yield SimulatedResponse(chunk)
+                await asyncio.sleep(self.chunk_delay)
+        return chunks()
@@ -0,0 +1,33 @@
+import asyncio
+
+class SingleFlight:
+    """Coalesce identical in-flight calls into one upstream request"""
+    def __init__(self):
+        self._in_flight = {}
+        self.stats = {"upstream_calls": 0, "absorbed_calls": 0}
+
+    async def do(self, key, coro_factory):
+        """
+        Run coro_factory() once per key while a call is in flight.
+        Every caller with the same key awaits the same result.
+        Must be used from a single event loop.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats["upstream_calls"] += 1
+            task = asyncio.ensure_future(coro_factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats["absorbed_calls"] += 1
+
+        # Shield so one waiter giving up does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def get_stats(self):
+        """Upstream vs absorbed call counts"""
+        stats = dict(self.stats)
+        stats["in_flight"] = len(self._in_flight)
+        total = stats["upstream_calls"] + stats["absorbed_calls"]
+        stats["absorbed_ratio"] = round(stats["absorbed_calls"] / total, 3) if total else 0.0
+        return stats
@@ -0,0 +1,249 @@
+import os
+import json
+import threading
+from collections import Counter, deque
+
+# Canonical skill -> synonyms and spelling variants, matched on word boundaries.
+# Lowercase synonyms match in any case; synonyms written with capitals match
+# only exactly as written, for names that are also ordinary words ("React"
+# but not "react quickly"). Extend with SKILL_TAXONOMY_PATH or add_skill().
+SKILL_TAXONOMY = {
+    # Languages
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "java script", "js", "ecmascript", "es6"],
+    "TypeScript": ["typescript", "ts"],
+    "C": ["c programming", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "c sharp", "csharp"],
+    "Go": ["golang", "go language"],
+    "Rust": ["rust"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["Swift"],
+    "PHP": ["php"],
+    "Ruby": ["ruby on rails", "ruby programming", "ruby language"],
+    "R": ["r programming", "rstudio", "r language"],
+    "MATLAB": ["matlab"],
+    "Scala": ["scala"],
+    "Bash": ["bash", "shell scripting", "shell script"],
+    "SQL": ["sql", "structured query language", "t-sql", "pl/sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "sass", "scss"],
+    # Frameworks and libraries
+    "React": ["React", "react.js", "reactjs"],
+    "React Native": ["react native"],
+    "Angular": ["Angular", "angularjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Express": ["express.js", "expressjs"],
+    "Django": ["django"],
+    "Flask": ["Flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "springboot", "spring framework"],
+    ".NET": [".net", "dotnet", "asp.net"],
+    "Flutter": ["flutter"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "Keras": ["keras"],
+    "Spark": ["apache spark", "pyspark", "Spark"],
+    "Hadoop": ["hadoop"],
+    # Data and AI
+    "Machine Learning": ["machine learning", "ML"],
+    "Deep Learning": ["deep learning"],
+    "Natural Language Processing": ["natural language processing", "nlp"],
+    "Computer Vision": ["computer vision", "opencv"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+    "Statistics": ["statistics", "statistical analysis"],
+    "Excel": ["Excel", "ms excel", "microsoft excel"],
+    "Power BI": ["power bi", "powerbi"],
+    "Tableau": ["tableau"],
+    # Databases
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "SQLite": ["sqlite"],
+    "Oracle Database": ["oracle database", "oracle db"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    # Cloud and DevOps
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Jenkins": ["jenkins"],
+    "CI/CD": ["ci/cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["git", "github", "gitlab", "version control"],
+    "Linux": ["linux", "unix", "ubuntu"],
+    "Microservices": ["microservices", "micro services", "microservice architecture"],
+    "REST APIs": ["rest api", "restful", "rest apis", "restful apis"],
+    "GraphQL": ["graphql"],
+    # Practices
+    "Agile": ["agile", "scrum", "kanban"],
+    "Unit Testing": ["unit testing", "unit tests", "pytest", "junit", "Jest"],
+    "System Design": ["system design", "software architecture"],
+    "Data Structures": ["data structures", "algorithms", "data structures and algorithms", "dsa"],
+    "Object-Oriented Programming": ["object-oriented programming", "object oriented programming", "oop", "OOPs", "OOPS"],
+    "Cybersecurity": ["cybersecurity", "cyber security", "information security", "network security"],
+    "Networking": ["computer networking", "network administration", "tcp/ip", "computer networks"],
+    # Design and media
+    "UI/UX Design": ["ui/ux", "ui design", "ux design", "user experience", "user interface design"],
+    "Figma": ["figma"],
+    "Adobe Photoshop": ["photoshop", "adobe photoshop"],
+    "Adobe Illustrator": ["illustrator", "adobe illustrator"],
+    "Adobe Premiere Pro": ["premiere pro", "adobe premiere"],
+    "After Effects": ["after effects", "adobe after effects"],
+    "Final Cut Pro": ["final cut pro", "final cut"],
+    "DaVinci Resolve": ["davinci resolve", "davinci"],
+    "CapCut": ["capcut"],
+    "Video Editing": ["video editing", "video editor", "editing videos"],
+    "Motion Graphics": ["motion graphics"],
+    "Graphic Design": ["graphic design", "graphic designing"],
+    "Content Creation": ["content creation", "content creator", "content writing"],
+    "Social Media Marketing": ["social media marketing", "social media management", "smm"],
+    "SEO": ["seo", "search engine optimization", "search engine optimisation"],
+    "Digital Marketing": ["digital marketing"],
+    "Copywriting": ["copywriting"],
+    # Business and soft skills
+    "Project Management": ["project management", "project planning"],
+    "Product Management": ["product management"],
+    "Leadership": ["leadership", "team leadership", "team lead"],
+    "Communication": ["communication", "communication skills"],
+    "Teamwork": ["teamwork", "team work", "team player", "collaboration"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+    "Critical Thinking": ["critical thinking"],
+    "Time Management": ["time management"],
+    "Public Speaking": ["public speaking", "presentation skills"],
+    "Customer Service": ["customer service", "customer support"],
+    "Sales": ["sales management", "business development"],
+    "Accounting": ["accounting", "bookkeeping", "tally erp", "tally prime"],
+}
+
+def _is_word_char(c):
+    return c.isalnum() or c == '_'
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills anywhere in a text in one linear pass. Every synonym
+    is compiled into an Aho-Corasick automaton over lowercased characters;
+    matches must sit on word boundaries (so "java" doesn't fire inside
+    "javascript"), synonyms with capitals must also match case, and
+    matches are reported under their canonical name.
+    """
+    def __init__(self, taxonomy=None):
+        self.taxonomy = {skill: list(names) for skill, names in (taxonomy or SKILL_TAXONOMY).items()}
+        path = os.getenv("SKILL_TAXONOMY_PATH")
+        if taxonomy is None and path:
+            with open(path) as f:
+                for skill, names in json.load(f).items():
+                    self.taxonomy.setdefault(skill, []).extend(names)
+        self._lock = threading.Lock()
+        self._build()
+
+    def add_skill(self, skill, *synonyms):
+        """Add a skill (or more synonyms for an existing one) and recompile"""
+        with self._lock:
+            self.taxonomy.setdefault(skill, []).extend(synonyms)
+            self._build()
+
+    def _build(self):
+        # Only listed synonyms are scanned for, so ambiguous canonical names
+        # ("Go", "R", "Spring") don't fire on ordinary words; normalize()
+        # also accepts the canonical names
+        synonyms = {}
+        for skill, names in self.taxonomy.items():
+            for name in names:
+                synonyms[name.strip()] = skill
+        self._canonical = {skill.lower(): skill for skill in self.taxonomy}
+        self._canonical.update((name.lower(), skill) for name, skill in synonyms.items())
+
+        # Trie: per-node transitions, then failure links by breadth-first search
+        goto = [{}]
+        outputs = [[]]
+        for name, skill in synonyms.items():
+            lowered = name.lower()
+            node = 0
+            for c in lowered:
+                if c not in goto[node]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[node][c] = len(goto) - 1
+                node = goto[node][c]
+            # Synonyms with capitals keep their exact spelling for a case check
+            outputs[node].append((len(name), skill, None if name == lowered else name))
+
+        fail = [0] * len(goto)
+        pending = deque(goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for c, child in goto[node].items():
+                pending.append(child)
+                state = fail[node]
+                while state and c not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(c, 0) if goto[state].get(c, 0) != child else 0
+                outputs[child] = outputs[child] + outputs[fail[child]]
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+
+    def scan(self, text):
+        """Yield (start, end, canonical skill) for every boundary-aligned match"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        lowered = text.lower()
+        length = len(lowered)
+        state = 0
+        for i, c in enumerate(lowered):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            for size, skill, exact in outputs[state]:
+                start, end = i - size + 1, i + 1
+                if exact is not None and text[start:end] != exact:
+                    continue
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if end < length and _is_word_char(lowered[end]) and _is_word_char(lowered[end - 1]):
+                    continue
+                yield start, end, skill
+
+    def count(self, text):
+        """Canonical skill -> number of mentions"""
+        return Counter(skill for _, _, skill in self.scan(text))
+
+    def find(self, text):
+        """Canonical skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(skill for _, _, skill in self.scan(text)))
+
+    def normalize(self, skill):
+        """Canonical name for a skill string if it is a known synonym, else the trimmed input"""
+        return self._canonical.get(skill.lower().strip(), skill.strip())
+
+_default_matcher = None
+_default_matcher_lock = threading.Lock()
+
+def get_skill_matcher():
+    """Process-wide matcher built from the taxonomy"""
+    global _default_matcher
+    with _default_matcher_lock:
+        if _default_matcher is None:
+            _default_matcher = SkillMatcher()
+        return _default_matcher
+
+def extract_skills(text):
+    return get_skill_matcher().find(text)
+
+def merge_skills(*skill_lists):
+    """Combine skill lists, normalising synonyms and dropping duplicates (first occurrence wins)"""
+    matcher = get_skill_matcher()
+    merged = {}
+    for skills in skill_lists:
+        for skill in skills:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            canonical = matcher.normalize(skill)
+            merged.setdefault(canonical.lower(), canonical)
+    return list(merged.values())
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class Speculator:
+    """
+    Runs likely-next generations in the background while the user is still
+    typing or speaking. Each speculation records the version of the context
+    it was built from (e.g. the debate turn count); if the context has moved
+    on by the time it is needed, the result is stale and thrown away.
+    Starting a key again with a newer version replaces the stale run.
+
+    fn receives a threading.Event that is set once its result will not be
+    used, so a long generation can stop early instead of running to the end.
+    """
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        self._pending = {}
+        self.stats = {"started": 0, "used": 0, "stale": 0, "discarded": 0}
+
+    def start(self, key, fn, version=None, on_discard=None):
+        """
+        Begin fn(cancelled) in the background unless the same key is already
+        running at this version. on_discard(result) is called with the result
+        of a run that ends up unused.
+        """
+        entry = self._pending.get(key)
+        if entry is not None:
+            if entry[1] == version:
+                return
+            self._drop(entry)
+            self.stats["stale"] += 1
+        cancelled = threading.Event()
+        self._pending[key] = (self._executor.submit(fn, cancelled), version, cancelled, on_discard)
+        self.stats["started"] += 1
+
+    def take(self, key, version=None):
+        """
+        Return the speculated result for key, waiting if it is still running.
+        Returns None if nothing was speculated, it failed, or it was started at
+        another version. Speculations started with version=None never go stale.
+        """
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return None
+        future, started_at = entry[0], entry[1]
+        if started_at is not None and started_at != version:
+            self._drop(entry)
+            self.stats["stale"] += 1
+            return None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Speculative generation failed: {e}")
+            return None
+        if result:
+            self.stats["used"] += 1
+        return result
+
+    def discard_all(self):
+        """Drop every pending speculation (e.g. at the end of a debate)"""
+        for entry in self._pending.values():
+            self._drop(entry)
+        self.stats["discarded"] += len(self._pending)
+        self._pending.clear()
+
+    def _drop(self, entry):
+        """Stop an unused run: cancel it if queued, else signal it to stop"""
+        future, _, cancelled, on_discard = entry
+        cancelled.set()
+        if future.cancel() or on_discard is None:
+            return
+
+        def report(done):
+            if done.exception() is None and done.result():
+                on_discard(done.result())
+        future.add_done_callback(report)
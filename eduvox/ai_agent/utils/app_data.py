@@ -0,0 +1,31 @@
+import os
+
+def app_data_dir():
+    """
+    Directory for the app's persistent files: EDUVOX_DATA_DIR, else the
+    per-user data directory (~/.local/share/eduvox, %LOCALAPPDATA%\\eduvox
+    on Windows). Created readable by the current user only.
+    """
+    base = os.getenv('EDUVOX_DATA_DIR')
+    if not base:
+        if os.name == 'nt':
+            base = os.path.join(os.getenv('LOCALAPPDATA', os.path.expanduser('~')), 'eduvox')
+        else:
+            data_home = os.getenv('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+            base = os.path.join(data_home, 'eduvox')
+    os.makedirs(base, mode=0o700, exist_ok=True)
+    return base
+
+def app_data_path(filename):
+    return os.path.join(app_data_dir(), filename)
+
+def create_private_file(path):
+    """
+    Create path with 0600 permissions if it doesn't exist yet, so SQLite
+    opens it instead of creating it under the default umask (usually 0644)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except FileExistsError:
+        pass
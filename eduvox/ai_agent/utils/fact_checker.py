@@ -101,12 +101,17 @@ import urllib.parse
 from typing import Dict, Any, List
 import os
 from dotenv import load_dotenv
+from utils.rate_limiter import get_rate_limiter
 
 class ImprovedFactChecker:
-    def __init__(self):
+    def __init__(self, wait_for_quota=False):
         # Load environment variables
         load_dotenv()
         
+        # Host-wide API quotas; by default a source with no quota left is skipped
+        self.rate_limiter = get_rate_limiter()
+        self.wait_for_quota = wait_for_quota
+        
         # Alternative APIs and configuration
         self.apis = {
             'mediastack_news': {
@@ -123,6 +128,18 @@ class ImprovedFactChecker:
             }
         }
     
+    def _has_quota(self, bucket: str) -> bool:
+        """
+        Take a token from the shared rate limiter for an API
+        
+        :param bucket: Rate limit bucket name
+        :return: False if the API should be skipped for now
+        """
+        if self.rate_limiter.acquire(bucket, block=self.wait_for_quota, timeout=10):
+            return True
+        print(f"Rate limit reached for {bucket}; skipping")
+        return False
+    
     def preprocess_claim(self, claim: str) -> str:
         """
         Preprocess the claim for better search matching
@@ -149,7 +166,7 @@ class ImprovedFactChecker:
         }
         
         # Try GNews API first
-        if self.apis['gnews_api']['api_key']:
+        if self.apis['gnews_api']['api_key'] and self._has_quota('gnews'):
             try:
                 response = requests.get(
                     self.apis['gnews_api']['endpoint'],
@@ -179,7 +196,7 @@ class ImprovedFactChecker:
                 print(f"GNews API error: {e}")
         
         # Fallback to MediaStack if GNews fails or no results
-        if not verification_results['sources'] and self.apis['mediastack_news']['api_key']:
+        if not verification_results['sources'] and self.apis['mediastack_news']['api_key'] and self._has_quota('mediastack'):
             try:
                 response = requests.get(
                     self.apis['mediastack_news']['endpoint'],
@@ -236,7 +253,7 @@ class ImprovedFactChecker:
         """
         Check claim using Google Fact Check API
         """
-        if not self.apis['google_fact_check']['api_key']:
+        if not self.apis['google_fact_check']['api_key'] or not self._has_quota('google_fact_check'):
             return None
 
         try:
@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from utils.rate_limiter import get_rate_limiter
 
 class GoogleFactChecker:
     def __init__(self):
@@ -12,6 +13,7 @@ class GoogleFactChecker:
             raise ValueError("Google Fact Check API key not found. Set GOOGLE_FACT_CHECK_API_KEY in .env")
         
         self.base_url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+        self.rate_limiter = get_rate_limiter()
     
     def check_claim(self, claim_text):
         """
@@ -23,6 +25,12 @@ class GoogleFactChecker:
         Returns:
             dict: Fact-checking results
         """
+        if not self.rate_limiter.acquire('google_fact_check', block=False):
+            return {
+                'status': 'error',
+                'message': 'Rate limit reached for Google Fact Check API'
+            }
+        
         params = {
             'query': claim_text,
             'key': self.api_key
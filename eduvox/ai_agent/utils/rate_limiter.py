@@ -0,0 +1,144 @@
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+from utils.app_data import app_data_path, create_private_file
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is rejected by the rate limiter"""
+    pass
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter shared by every process on the host.
+    Bucket state lives in a SQLite file and is updated inside an
+    immediate transaction, so gunicorn workers draw from the same quota
+    without any external service.
+    """
+    # name: (capacity, seconds to refill the full capacity)
+    DEFAULT_BUCKETS = {
+        'gemini': (60, 60),
+        'gnews': (100, 24 * 3600),
+        'mediastack': (100, 30 * 24 * 3600),
+        'google_fact_check': (60, 60)
+    }
+
+    def __init__(self, db_path=None, buckets=None):
+        self.db_path = db_path or os.getenv('RATE_LIMIT_DB') or app_data_path('rate_limits.db')
+        self.buckets = {}
+        for name, (capacity, period) in (buckets or self.DEFAULT_BUCKETS).items():
+            # RATE_LIMIT_GEMINI="120/60" overrides capacity/period per bucket
+            override = os.getenv(f'RATE_LIMIT_{name.upper()}')
+            if override:
+                capacity, _, period = override.partition('/')
+            self.buckets[name] = (float(capacity), float(capacity) / float(period))
+
+        create_private_file(self.db_path)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        """One connection per thread; SQLite handles the cross-process locking"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _take(self, bucket, tokens):
+        """Try to take tokens; return 0 on success or the seconds to wait"""
+        capacity, rate = self.buckets[bucket]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (bucket,)).fetchone()
+            available = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+
+            wait = 0.0
+            if available >= tokens:
+                available -= tokens
+            else:
+                wait = (tokens - available) / rate
+
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (bucket, available, now)
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _peek(self, bucket, tokens):
+        """Seconds until `tokens` would be available, without taking any"""
+        capacity, rate = self.buckets[bucket]
+        row = self._connect().execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (bucket,)).fetchone()
+        available = capacity if row is None else min(capacity, row[0] + (time.time() - row[1]) * rate)
+        return 0.0 if available >= tokens else (tokens - available) / rate
+
+    def wait_available(self, bucket, tokens=1, timeout=None):
+        """
+        Block until the bucket could serve `tokens`, without taking them.
+        Lets batch workers queue at the quota instead of timing out inside a call.
+        """
+        if bucket not in self.buckets:
+            raise ValueError(f"Unknown rate limit bucket: {bucket}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._peek(bucket, tokens)
+            if wait == 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def acquire(self, bucket, tokens=1, block=True, timeout=None):
+        """
+        Take tokens from a bucket.
+        block=False rejects immediately when the bucket is empty; otherwise
+        wait up to timeout seconds (forever when None). Returns True on success.
+        """
+        if bucket not in self.buckets:
+            raise ValueError(f"Unknown rate limit bucket: {bucket}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._take(bucket, tokens)
+            if wait == 0:
+                return True
+            if not block or (deadline is not None and time.monotonic() + wait > deadline):
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, bucket, tokens=1, block=True, timeout=None):
+        """
+        acquire() for event loops: the SQLite transaction (which can wait on
+        other workers' locks) runs in a thread and waits use asyncio.sleep
+        """
+        if bucket not in self.buckets:
+            raise ValueError(f"Unknown rate limit bucket: {bucket}")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = await asyncio.to_thread(self._take, bucket, tokens)
+            if wait == 0:
+                return True
+            if not block or (deadline is not None and time.monotonic() + wait > deadline):
+                return False
+            await asyncio.sleep(wait)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Process-wide limiter instance"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter